@@ -4,30 +4,38 @@ Custom integration to integrate Saleryd HRV system with Home Assistant.
 
 from __future__ import annotations
 
-import asyncio
 from datetime import timedelta
 from typing import TYPE_CHECKING
 
-import async_timeout
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.loader import async_get_loaded_integration
 from homeassistant.util import slugify
 from pysaleryd.client import Client
 
+from .capture import SalerydLokeCapture
 from .const import (
+    CAPTURE_FILENAME,
+    CONF_CAPTURE,
     CONF_ENABLE_INSTALLER_SETTINGS,
     CONF_INSTALLER_PASSWORD,
+    CONF_LAZY_STARTUP,
+    CONF_ROLLING_STATISTICS,
+    CONF_STATISTICS,
     CONF_WEBSOCKET_IP,
     CONF_WEBSOCKET_PORT,
     CONFIG_VERSION,
+    CONNECT_TIMEOUT,
     DEFAULT_NAME,
     DEPRECATED_CONF_ENABLE_MAINTENANCE_SETTINGS,
     DEPRECATED_CONF_MAINTENANCE_PASSWORD,
     DOMAIN,
     LOGGER,
+    MANUFACTURER,
     PLATFORMS,
     STARTUP_MESSAGE,
 )
@@ -39,6 +47,10 @@ if TYPE_CHECKING:
 from .bridge import SalerydLokeBridge
 from .coordinator import SalerydLokeDataUpdateCoordinator
 from .data import SalerydLokeData
+from .metrics import SalerydLokeMetrics
+from .rolling import SalerydLokeRollingStatistics
+from .storage import SalerydLokeSnapshotStore, SalerydLokeTotalsStore
+from .supervisor import SalerydLokeConnectionSupervisor
 
 SCAN_INTERVAL = timedelta(seconds=30)
 
@@ -104,26 +116,90 @@ async def async_setup_entry(hass: HomeAssistant, entry: "SalerydLokeConfigEntry"
     port = entry.data.get(CONF_WEBSOCKET_PORT)
 
     session = async_create_clientsession(hass, raise_for_status=True)
-    client = Client(url, port, session, SCAN_INTERVAL.seconds)
-    try:
-        async with async_timeout.timeout(10):
-            await client.connect()
-    except (TimeoutError, asyncio.CancelledError) as ex:
-        client.disconnect()
-        raise ConfigEntryNotReady(f"Timeout while connecting to {url}:{port}") from ex
-    else:
-        coordinator = SalerydLokeDataUpdateCoordinator(hass, LOGGER)
-        bridge = SalerydLokeBridge(entry, client, coordinator, LOGGER)
-        entry.runtime_data = SalerydLokeData(
-            client=client,
-            coordinator=coordinator,
-            integration=integration,
-            bridge=bridge,
+    metrics = SalerydLokeMetrics()
+    supervisor = SalerydLokeConnectionSupervisor(
+        hass, lambda: Client(url, port, session, SCAN_INTERVAL.seconds), metrics
+    )
+    client = None
+    if not entry.options.get(CONF_LAZY_STARTUP):
+        try:
+            client = await supervisor.async_connect(CONNECT_TIMEOUT)
+        except TimeoutError as ex:
+            raise ConfigEntryNotReady(
+                f"Timeout while connecting to {url}:{port}"
+            ) from ex
+
+    coordinator = SalerydLokeDataUpdateCoordinator(hass, LOGGER)
+    capture = None
+    if entry.options.get(CONF_CAPTURE):
+        capture = SalerydLokeCapture(
+            hass, hass.config.path(CAPTURE_FILENAME.format(entry_id=entry.entry_id))
         )
-        await coordinator.async_config_entry_first_refresh()
-
-        # Setup platforms
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        await capture.async_start()
+        entry.async_on_unload(capture.async_stop)
+    store = SalerydLokeSnapshotStore(hass, entry.entry_id)
+    totals_store = SalerydLokeTotalsStore(hass, entry.entry_id)
+    restored = await store.async_load()
+    totals = await totals_store.async_load()
+    entry.async_on_unload(store.async_flush)
+    entry.async_on_unload(totals_store.async_flush)
+    rolling = (
+        SalerydLokeRollingStatistics()
+        if entry.options.get(CONF_ROLLING_STATISTICS)
+        else None
+    )
+    bridge = SalerydLokeBridge(
+        entry,
+        client,
+        coordinator,
+        LOGGER,
+        capture,
+        metrics,
+        store,
+        totals_store,
+        rolling,
+    )
+    if restored:
+        bridge.restore_snapshot(*restored)
+    bridge.restore_totals(totals)
+    statistics = None
+    if entry.options.get(CONF_STATISTICS):
+        if "recorder" in hass.config.components:
+            # recorder is only imported when statistics are enabled
+            from .statistics import SalerydLokeStatistics
+
+            statistics = SalerydLokeStatistics(hass, entry)
+            statistics.async_start()
+            entry.async_on_unload(statistics.async_stop)
+        else:
+            LOGGER.warning("Recorder is not loaded, statistics will not be imported")
+    entry.runtime_data = SalerydLokeData(
+        client=client,
+        coordinator=coordinator,
+        integration=integration,
+        bridge=bridge,
+        metrics=metrics,
+        statistics=statistics,
+        rolling=rolling,
+        # shared by all entities of the entry
+        device_info=DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.data.get(CONF_NAME),
+            manufacturer=MANUFACTURER,
+        ),
+    )
+
+    @callback
+    def _async_reconnected(client: Client) -> None:
+        entry.runtime_data.client = client
+        bridge.set_client(client)
+
+    supervisor.async_start(client, _async_reconnected, bridge.update_client_state)
+    entry.async_on_unload(supervisor.async_shutdown)
+    await coordinator.async_config_entry_first_refresh()
+
+    # Setup platforms
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
@@ -137,13 +213,22 @@ async def async_unload_entry(
     # unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    # disconnect client
-    client: SalerydLokeDataUpdateCoordinator = entry.runtime_data.client
-    client.disconnect()
+    # disconnect client, unless still connecting
+    client = entry.runtime_data.client
+    if client is not None:
+        client.disconnect()
 
     return unload_ok
 
 
+async def async_remove_entry(
+    hass: HomeAssistant, entry: "SalerydLokeConfigEntry"
+) -> None:
+    """Remove persisted data of a removed entry."""
+    await SalerydLokeSnapshotStore(hass, entry.entry_id).async_remove()
+    await SalerydLokeTotalsStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant, entry: "SalerydLokeConfigEntry"
 ) -> None:
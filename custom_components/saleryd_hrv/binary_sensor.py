@@ -16,11 +16,12 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 from pysaleryd.const import DataKeyEnum
-from pysaleryd.utils import ErrorSystemProperty, SystemProperty
+from pysaleryd.utils import ErrorSystemProperty
 from pysaleryd.websocket import State
 
-from .const import KEY_CLIENT_STATE, ModeEnum
+from .const import KEY_CLIENT_STATE, KEY_SNAPSHOT_RESTORED, ModeEnum
 from .entity import SalerydLokeEntity
+from .snapshot import SalerydLokeProperty
 
 if TYPE_CHECKING:
     from .coordinator import SalerydLokeDataUpdateCoordinator
@@ -44,42 +45,49 @@ class SalerydLokeBinarySensor(SalerydLokeEntity, BinarySensorEntity):
         self.state_when_on = state_when_on
         super().__init__(coordinator, entry, entity_description)
 
-    def _is_on(self, system_property: SystemProperty):
+    def _is_on(self, system_property: SalerydLokeProperty):
         return system_property.value
 
     @property
     def is_on(self):
-        system_property = SystemProperty.from_str(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key),
-        )
+        system_property = self.get_property()
         if system_property.value is None:
             return
 
         return system_property.value == self.state_when_on.value
 
     def _get_extra_state_attributes(
-        self, system_property: SystemProperty
+        self, system_property: SalerydLokeProperty
     ) -> dict[str, Any] | None:
         return None
 
     @property
     def extra_state_attributes(self):
-        value = SystemProperty.from_str(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key),
-        )
-        return self._get_extra_state_attributes(value)
+        return self._get_extra_state_attributes(self.get_property())
 
 
 class SalerydLokeErrorMessageBinarySensor(SalerydLokeBinarySensor):
+    """Error message sensor, errors are decoded once per distinct raw value"""
+
+    _raw_error = None
+    _error: ErrorSystemProperty | None = None
+    _error_attributes: dict[str, Any] | None = None
+
+    def _get_error(self) -> ErrorSystemProperty:
+        raw_error = self.get_value()
+        if self._error is None or raw_error != self._raw_error:
+            self._raw_error = raw_error
+            self._error = ErrorSystemProperty(self.entity_description.key, raw_error)
+            self._error_attributes = (
+                None
+                if self._error.value is None
+                else {v: True for v in self._error.value}
+            )
+        return self._error
 
     @property
     def is_on(self):
-        error = ErrorSystemProperty(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key, None),
-        )
+        error = self._get_error()
         if error.value is None:
             return
 
@@ -87,26 +95,24 @@ class SalerydLokeErrorMessageBinarySensor(SalerydLokeBinarySensor):
 
     @property
     def extra_state_attributes(self):
-        error = ErrorSystemProperty(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key, None),
-        )
-        if error.value is None:
-            return None
-
-        attrs = {}
-        for v in error.value:
-            attrs[v] = True
-
-        return attrs
+        self._get_error()
+        return self._error_attributes
 
 
 class SalerydLokeConnectionStateBinarySensor(SalerydLokeBinarySensor):
 
-    def _get_extra_state_attributes(self, system_property: SystemProperty):
-        if system_property.value is None:
-            return None
-        return {system_property.value: True}
+    @property
+    def data_keys(self):
+        return (*super().data_keys, KEY_SNAPSHOT_RESTORED)
+
+    def _get_extra_state_attributes(self, system_property: SalerydLokeProperty):
+        attributes = {}
+        if system_property.value is not None:
+            attributes[system_property.value] = True
+        # values are stale until data is received from the HRV system
+        if restored_at := self.coordinator.data.get(KEY_SNAPSHOT_RESTORED):
+            attributes["restored_snapshot_saved_at"] = restored_at
+        return attributes or None
 
 
 async def async_setup_entry(
@@ -1,14 +1,40 @@
-from typing import TYPE_CHECKING
+import asyncio
+from collections import ChainMap
+import math
+import time
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
 from pysaleryd.const import DataKeyEnum
+from pysaleryd.websocket import State
 
-from .const import CONF_INSTALLER_PASSWORD, KEY_CLIENT_STATE, KEY_TARGET_TEMPERATURE
+from .commands import SalerydLokeCommandQueue
+from .const import (
+    CONF_AUTH_TIMEOUT,
+    CONF_COALESCE_WINDOW,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_INSTALLER_PASSWORD,
+    KEY_CLIENT_STATE,
+    KEY_SNAPSHOT_RESTORED,
+    KEY_TARGET_TEMPERATURE,
+)
+from .derived import SalerydLokeDerivedData, SalerydLokeTotals
+from .metrics import SalerydLokeMetrics
+from .snapshot import SalerydLokeProperty, SalerydLokeSnapshot
 
 if TYPE_CHECKING:
     from pysaleryd.client import Client
 
+    from .capture import SalerydLokeCapture
     from .coordinator import SalerydLokeDataUpdateCoordinator
     from .data import SalerydLokeConfigEntry
+    from .rolling import SalerydLokeRollingStatistics
+    from .storage import SalerydLokeSnapshotStore, SalerydLokeTotalsStore
+
+
+_MISSING = object()
 
 
 class SalerydLokeBridge:
@@ -17,37 +43,295 @@ class SalerydLokeBridge:
     def __init__(
         self,
         entry: "SalerydLokeConfigEntry",
-        client: "Client",
+        client: "Client | None",
         coordinator: "SalerydLokeDataUpdateCoordinator",
         logger,
+        capture: "SalerydLokeCapture | None" = None,
+        metrics: SalerydLokeMetrics | None = None,
+        store: "SalerydLokeSnapshotStore | None" = None,
+        totals_store: "SalerydLokeTotalsStore | None" = None,
+        rolling: "SalerydLokeRollingStatistics | None" = None,
     ):
         self.client = client
+        self.capture = capture
+        self.store = store
+        self.totals_store = totals_store
+        self.rolling = rolling
+        self.metrics = metrics or SalerydLokeMetrics()
         self.coordinator = coordinator
         self.logger = logger
         self.entry = entry
+        self._snapshot = SalerydLokeSnapshot()
+        self._coalesce_window = entry.options.get(CONF_COALESCE_WINDOW, 0) / 1000
+        self._coalesced_data: dict | None = None
+        self._last_update = -math.inf
+        self._unsub_coalesced_update: CALLBACK_TYPE | None = None
+        self._commands = SalerydLokeCommandQueue(coordinator.hass, self.__send_batch)
+        self._auth_timeout = entry.options.get(CONF_AUTH_TIMEOUT, 0)
+        self._authenticated_at = -math.inf
+        self._confirm_timeout = entry.options.get(CONF_CONFIRM_TIMEOUT, 0)
+        self._confirmations: dict[str, tuple[Any, float, asyncio.Future[bool]]] = {}
+        self._totals = SalerydLokeTotals()
+        self._derived = SalerydLokeDerivedData()
+
+        if client is not None:
+            client.add_handler(self.update_data_callback)
+        self.entry.async_on_unload(self.__cancel_coalesced_update)
+        self.entry.async_on_unload(self._commands.async_shutdown)
 
+    @callback
+    def set_client(self, client: "Client"):
+        """Replace client, e.g. after reconnecting"""
+        if self.client is not None:
+            self.client.remove_handler(self.update_data_callback)
+        self.client = client
         self.client.add_handler(self.update_data_callback)
+        self.invalidate_authentication()
+
+    @callback
+    def restore_snapshot(self, data: dict[str, Any], saved_at: str):
+        """Show persisted data until data is received from the client
+
+        The restored snapshot is marked stale by the time it was saved, which is
+        removed with the first update from the client.
+        """
+        self.__set_data({**data, KEY_SNAPSHOT_RESTORED: saved_at})
+
+    @callback
+    def restore_totals(self, totals: dict[str, float]):
+        """Continue accumulating persisted totals"""
+        if totals:
+            self._totals.restore(totals)
+            self.__set_data(self._totals.data)
+
+    @callback
+    def update_client_state(self, state: State):
+        """Publish connection state, e.g. while the supervisor reconnects
+
+        The state is otherwise published with frames from the client, which are not
+        received while reconnecting.
+        """
+        if state != State.RUNNING:
+            self._totals.interrupt()
+            self._derived.interrupt()
+            if self.rolling:
+                self.rolling.interrupt()
+        if self._snapshot.get(KEY_CLIENT_STATE) != state.value:
+            self.__set_data({KEY_CLIENT_STATE: state.value})
+
+    def __set_data(self, data: dict[str, Any]):
+        self._snapshot = self._snapshot.evolve(data, data.keys())
+        self.coordinator.async_set_changed_data(self._snapshot, frozenset(data))
 
     def update_data_callback(self, data):
-        """Update coordindator data"""
+        """Handle data received from client"""
         self.logger.debug("Received data")
-        _data = data.copy()
-        self.__inject_virtual_keys(_data)
-        self.coordinator.async_set_updated_data(_data)
+        started = time.perf_counter()
+        now = time.monotonic()
+        self.metrics.record_frame(now)
+        if self.client.state != State.RUNNING:
+            self.invalidate_authentication()
+        if self.capture:
+            self.capture.record_frame(data)
+        if self._confirmations:
+            self.__confirm(data)
+        if self._coalesce_window:
+            self.__coalesce(data)
+        else:
+            self.__update_data(data)
+        self.metrics.dispatch_time.record(time.perf_counter() - started)
+
+    def __coalesce(self, data):
+        """Merge frames received within the coalescing window into one update"""
+        if self._unsub_coalesced_update is None:
+            delay = self._last_update + self._coalesce_window - time.monotonic()
+            if delay <= 0:
+                # idle, update right away
+                self._last_update = time.monotonic()
+                self.__update_data(data)
+                return
+            self._coalesced_data = {}
+            self._unsub_coalesced_update = async_call_later(
+                self.coordinator.hass, delay, self.__update_coalesced_data
+            )
+        self._coalesced_data.update(data)
+
+    @callback
+    def __update_coalesced_data(self, _now):
+        """Update coordinator data with frames merged during coalescing window"""
+        self._unsub_coalesced_update = None
+        self._last_update = time.monotonic()
+        data, self._coalesced_data = self._coalesced_data, None
+        self.__update_data(data)
 
-    def __inject_virtual_keys(self, data):
-        """Inject additional keys for virtual sensors not present in the data set"""
-        data[KEY_CLIENT_STATE] = self.client.state.value
-        data[KEY_TARGET_TEMPERATURE] = None
+    def __cancel_coalesced_update(self):
+        if self._unsub_coalesced_update is not None:
+            self._unsub_coalesced_update()
+            self._unsub_coalesced_update = None
 
-    async def send_command(self, key: DataKeyEnum, data: str | int, auth: bool = False):
-        """Send command to client"""
+    def __update_data(self, data):
+        """Update coordindator data with the keys that changed since last update"""
+        now = time.monotonic()
+        running = self.client.state == State.RUNNING
+        if running:
+            # rates of the previous snapshot were held until this update
+            self._totals.update(self._snapshot, now)
+            if self.rolling:
+                self.rolling.update(self._snapshot, now)
+        else:
+            # data is the last data of the client, not sent by the unit
+            self._totals.interrupt()
+            if self.rolling:
+                self.rolling.interrupt()
+        # client data is not copied, only changed keys are read into the snapshot
+        virtual_data = self.__get_virtual_data()
+        changed_keys = self.__get_changed_keys(
+            data, virtual_data, self._totals.data, self._derived.data
+        )
+        if changed_keys:
+            for key in changed_keys:
+                if key in data:
+                    self.metrics.record_key_update(key, data[key], now)
+            self._snapshot = self._snapshot.evolve(
+                ChainMap(virtual_data, self._totals.data, data), changed_keys
+            )
+        # moving averages advance with time, also when values are unchanged
+        if derived_changed_keys := self._derived.update(
+            self._snapshot, changed_keys, now if running else None
+        ):
+            self._snapshot = self._snapshot.evolve(
+                self._derived.data, derived_changed_keys
+            )
+            changed_keys |= derived_changed_keys
+        if not changed_keys:
+            self.logger.debug("Data unchanged, skipping update")
+            return
+        self.coordinator.async_set_changed_data(self._snapshot, changed_keys)
+        if self.store:
+            self.store.async_schedule_save(self._snapshot)
+        if self.totals_store and not changed_keys.isdisjoint(self._totals.totals):
+            self.totals_store.async_schedule_save(dict(self._totals.totals))
+
+    def __get_changed_keys(self, *sources) -> frozenset[str]:
+        """Get keys added, changed or removed compared to previous update"""
+        previous = self._snapshot
+        changed_keys = []
+        existing = 0
+        for source in sources:
+            for key, value in source.items():
+                previous_value = previous.get(key, _MISSING)
+                if previous_value is _MISSING:
+                    changed_keys.append(key)
+                    continue
+                existing += 1
+                if previous_value != value:
+                    changed_keys.append(key)
+        if existing < len(previous):
+            changed_keys.extend(
+                key for key in previous if not any(key in source for source in sources)
+            )
+        return frozenset(changed_keys)
+
+    def __get_virtual_data(self):
+        """Get additional keys for virtual sensors not present in the data set"""
+        return {
+            KEY_CLIENT_STATE: self.client.state.value,
+            KEY_TARGET_TEMPERATURE: None,
+        }
+
+    async def send_command(
+        self, key: DataKeyEnum, data: str | int, auth: bool = False
+    ) -> bool:
+        """Send command to client
+
+        Commands sent concurrently are merged by key and sent in one batch. When
+        confirmation is enabled, wait until the new value is received from the unit.
+        Returns False if the command was not confirmed before the timeout.
+        """
+        if not self._confirm_timeout:
+            await self._commands.async_send(key, data, auth)
+            return True
+
+        # expect value before sending, the acknowledge may arrive before the send returns
+        future = self.__expect(key, data)
+        try:
+            await self._commands.async_send(key, data, auth)
+            async with asyncio.timeout(self._confirm_timeout):
+                return await future
+        except TimeoutError:
+            self.logger.warning(
+                "Command %s with payload %s was not confirmed within %s seconds",
+                key,
+                data,
+                self._confirm_timeout,
+            )
+            self.metrics.commands_timed_out += 1
+            if auth:
+                self.invalidate_authentication()
+            return False
+        finally:
+            confirmation = self._confirmations.get(key)
+            if confirmation and confirmation[2] is future:
+                del self._confirmations[key]
+
+    def __expect(self, key: str, data: str | int) -> asyncio.Future[bool]:
+        """Wait for key to be received with value, superseding earlier commands"""
+        if previous := self._confirmations.get(key):
+            previous[2].set_result(False)
+        future = self.coordinator.hass.loop.create_future()
+        self._confirmations[key] = (data, time.monotonic(), future)
+        return future
+
+    def __confirm(self, data):
+        """Confirm commands with values that have been received"""
+        now = time.monotonic()
+        for key, (value, sent_at, future) in list(self._confirmations.items()):
+            if (
+                key in data
+                and SalerydLokeProperty.from_raw(key, data[key]).value == value
+            ):
+                del self._confirmations[key]
+                self.metrics.commands_confirmed += 1
+                self.metrics.command_latency.record(now - sent_at)
+                future.set_result(True)
+
+    async def __send_batch(self, commands: list[tuple[str, str | int]], auth: bool):
+        """Send batch of commands without waiting for each command to complete"""
+        if self.client is None:
+            raise HomeAssistantError("Not connected to HRV system")
 
         async def send(key, data):
             self.logger.debug("Sending control request %s with payload %s", key, data)
+            if self.capture:
+                self.capture.record_command(key, data)
             await self.client.send_command(key, data)
+            self.metrics.commands_sent += 1
+
+        try:
+            if auth and not self.__is_authenticated():
+                # the unit must accept the password before the installer commands
+                installer_password = self.entry.data.get(CONF_INSTALLER_PASSWORD)
+                await send(DataKeyEnum.INSTALLER_PASSWORD, installer_password)
+                self._authenticated_at = time.monotonic()
+            # messages are written in order, before any of the sends wait for the unit
+            await asyncio.gather(*(send(key, data) for key, data in commands))
+        except Exception:
+            self.invalidate_authentication()
+            raise
+
+    def __is_authenticated(self) -> bool:
+        """Return true if the installer session is still valid"""
+        return (
+            self.client.state == State.RUNNING
+            and time.monotonic() - self._authenticated_at < self._auth_timeout
+        )
+
+    @property
+    def command_queue_depth(self) -> int:
+        """Number of commands waiting to be sent"""
+        return self._commands.depth
 
-        if auth:
-            installer_password = self.entry.data.get(CONF_INSTALLER_PASSWORD)
-            await send(DataKeyEnum.INSTALLER_PASSWORD, installer_password)
-        await send(key, data)
+    @callback
+    def invalidate_authentication(self):
+        """Send installer password with the next installer command"""
+        self._authenticated_at = -math.inf
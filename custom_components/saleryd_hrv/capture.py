@@ -0,0 +1,129 @@
+"""Capture of websocket traffic for offline replay"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import IO, TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from pysaleryd.const import DataKeyEnum
+
+from .const import CAPTURE_QUEUE_SIZE, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_MISSING = object()
+
+MASKED_VALUE = "***"
+
+
+class SalerydLokeCapture:
+    """Append-only capture of received frames and sent commands
+
+    Records are written as JSON lines, `{"t": seconds, "frame": {changed keys}}` and
+    `{"t": seconds, "command": [key, value]}`, the format of recorded sessions replayed
+    by the simulator and benchmarks in tests. Records are buffered in a bounded queue
+    and written in the executor, records are dropped when the queue is full. The
+    installer password is masked.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, path: str, maxsize: int = CAPTURE_QUEUE_SIZE
+    ) -> None:
+        self.hass = hass
+        self.path = path
+        self.dropped = 0
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+        self._data: dict[str, Any] = {}
+        self._start = time.monotonic()
+        self._file: IO[str] | None = None
+        self._task: asyncio.Task | None = None
+        self._write_job: asyncio.Future | None = None
+
+    async def async_start(self) -> None:
+        """Open capture file and start writer"""
+        self._start = time.monotonic()
+        self._data = {}
+        # written right away, the queue only buffers frames and commands
+        await self.hass.async_add_executor_job(
+            self.__open, {"t": 0, "start": dt_util.utcnow().isoformat()}
+        )
+        self._task = self.hass.async_create_background_task(
+            self.__async_write(), "saleryd_hrv capture"
+        )
+        LOGGER.info("Capturing websocket traffic to %s", self.path)
+
+    async def async_stop(self) -> None:
+        """Write buffered records and close capture file"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._write_job:
+            await self._write_job
+        if self._file:
+            await self.hass.async_add_executor_job(
+                self.__write, self.__get_records(), True
+            )
+            self._file = None
+        if self.dropped:
+            LOGGER.warning("Dropped %s records while capturing", self.dropped)
+
+    @callback
+    def record_frame(self, data: dict[str, Any]) -> None:
+        """Record keys that changed since the previous frame"""
+        frame = {
+            key: value
+            for key, value in data.items()
+            if self._data.get(key, _MISSING) != value
+        }
+        self._data.update(frame)
+        if DataKeyEnum.INSTALLER_PASSWORD in frame:
+            frame[DataKeyEnum.INSTALLER_PASSWORD] = MASKED_VALUE
+        self.__put({"frame": frame})
+
+    @callback
+    def record_command(self, key: str, value: Any) -> None:
+        """Record sent command"""
+        if key == DataKeyEnum.INSTALLER_PASSWORD:
+            value = MASKED_VALUE
+        self.__put({"command": [key, value]})
+
+    def __put(self, record: dict[str, Any]) -> None:
+        record = {"t": round(time.monotonic() - self._start, 3), **record}
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            if not self.dropped:
+                LOGGER.warning("Capture buffer is full, dropping records")
+            self.dropped += 1
+
+    def __get_records(self) -> list[dict[str, Any]]:
+        records = []
+        while not self._queue.empty():
+            records.append(self._queue.get_nowait())
+        return records
+
+    async def __async_write(self) -> None:
+        """Write records in batches as they are queued"""
+        while True:
+            records = [await self._queue.get()]
+            records.extend(self.__get_records())
+            self._write_job = self.hass.async_add_executor_job(self.__write, records)
+            # let an ongoing write finish when stopped
+            await asyncio.shield(self._write_job)
+
+    def __open(self, start_record: dict[str, Any]) -> None:
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.__write([start_record])
+
+    def __write(self, records: list[dict[str, Any]], close: bool = False) -> None:
+        self._file.writelines(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in records
+        )
+        self._file.flush()
+        if close:
+            self._file.close()
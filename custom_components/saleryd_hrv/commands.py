@@ -0,0 +1,84 @@
+"""Command queue"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+type SendBatchCallable = Callable[[list[tuple[str, Any]], bool], Awaitable[None]]
+
+
+class SalerydLokeCommandQueue:
+    """Merge and batch commands sent concurrently
+
+    Commands queued while waiting for the next batch are merged by key, last writer
+    wins, and otherwise kept in the order they were queued. Batches are sent one at
+    a time, in order.
+    """
+
+    def __init__(self, hass: HomeAssistant, send_batch: SendBatchCallable) -> None:
+        self.hass = hass
+        self._send_batch = send_batch
+        self._pending: dict[str, tuple[Any, bool, asyncio.Future[None]]] = {}
+        self._sending: dict[str, tuple[Any, bool, asyncio.Future[None]]] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        """Number of commands waiting to be sent"""
+        return len(self._pending) + len(self._sending)
+
+    async def async_send(self, key: str, value: Any, auth: bool = False) -> None:
+        """Queue command and wait until the batch it is part of has been sent"""
+        if key in self._pending:
+            _, pending_auth, future = self._pending[key]
+            auth = auth or pending_auth
+        else:
+            future = self.hass.loop.create_future()
+        self._pending[key] = (value, auth, future)
+
+        if self._task is None:
+            self._task = self.hass.async_create_task(
+                self.__async_send_pending(), "saleryd_hrv commands", eager_start=False
+            )
+        # merged commands share a future, a cancelled caller must not cancel it
+        await asyncio.shield(future)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel queued commands"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for commands in (self._sending, self._pending):
+            for _, _, future in commands.values():
+                future.cancel()
+            commands.clear()
+
+    async def __async_send_pending(self) -> None:
+        try:
+            # let commands sent concurrently, e.g. by a scene, join the batch
+            await asyncio.sleep(0)
+            while self._pending:
+                self._sending, self._pending = self._pending, {}
+                commands = [
+                    (key, value) for key, (value, _, _) in self._sending.items()
+                ]
+                auth = any(auth for _, auth, _ in self._sending.values())
+                try:
+                    await self._send_batch(commands, auth)
+                except Exception as err:  # pylint: disable=broad-except
+                    for _, _, future in self._sending.values():
+                        future.set_exception(err)
+                else:
+                    for _, _, future in self._sending.values():
+                        future.set_result(None)
+                self._sending = {}
+        finally:
+            self._task = None
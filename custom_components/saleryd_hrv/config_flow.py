@@ -7,18 +7,32 @@ from typing import Any, Mapping
 import async_timeout
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from pysaleryd.client import Client
 import voluptuous as vol
 
 from .const import (
+    CONF_AUTH_TIMEOUT,
+    CONF_CAPTURE,
+    CONF_COALESCE_WINDOW,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
     CONF_ENABLE_INSTALLER_SETTINGS,
     CONF_INSTALLER_PASSWORD,
+    CONF_LAZY_STARTUP,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_ROLLING_STATISTICS,
+    CONF_SENSOR,
+    CONF_SENSOR_FILTERS,
+    CONF_STATISTICS,
     CONF_WEBSOCKET_IP,
     CONF_WEBSOCKET_PORT,
     CONFIG_VERSION,
     DEFAULT_NAME,
     DOMAIN,
+    FILTERABLE_SENSORS,
     LOGGER,
 )
 
@@ -37,6 +51,38 @@ CONFIG_DATA = {
 CONFIG_SCHEMA = vol.Schema({**CONFIG_DATA})
 RECONFIG_SCHEMA = vol.Schema({**RECONFIG_DATA})
 
+SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_COALESCE_WINDOW, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=1000)
+        ),
+        vol.Optional(CONF_AUTH_TIMEOUT, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=3600)
+        ),
+        vol.Optional(CONF_CONFIRM_TIMEOUT, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=60)
+        ),
+        vol.Optional(CONF_LAZY_STARTUP, default=False): bool,
+        vol.Optional(CONF_STATISTICS, default=False): bool,
+        vol.Optional(CONF_ROLLING_STATISTICS, default=False): bool,
+        vol.Optional(CONF_CAPTURE, default=False): bool,
+    }
+)
+SENSOR_SCHEMA = vol.Schema({vol.Required(CONF_SENSOR): vol.In(FILTERABLE_SENSORS)})
+SENSOR_FILTER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_DEADBAND_ABSOLUTE, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_DEADBAND_PERCENT, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(CONF_MIN_PUBLISH_INTERVAL, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+    }
+)
+
 
 @config_entries.HANDLERS.register(DOMAIN)
 class SalerydLokeFlowHandler(config_entries.ConfigFlow):
@@ -50,6 +96,14 @@ class SalerydLokeFlowHandler(config_entries.ConfigFlow):
         """Initialize."""
         self._errors = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SalerydLokeOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return SalerydLokeOptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
         self._errors = {}
@@ -147,3 +201,64 @@ class SalerydLokeFlowHandler(config_entries.ConfigFlow):
         except Exception as e:  # pylint: disable=broad-except
             LOGGER.error("Could not connect", exc_info=True)
             raise e
+
+
+class SalerydLokeOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for SalerydLoke."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        """Initialize."""
+        self._config_entry = config_entry
+        self._sensor: str | None = None
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        return self.async_show_menu(step_id="init", menu_options=["settings", "sensor"])
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Configure integration settings."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**self._config_entry.options, **user_input}
+            )
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=self.add_suggested_values_to_schema(
+                SETTINGS_SCHEMA, self._config_entry.options
+            ),
+        )
+
+    async def async_step_sensor(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Select sensor to configure deadband and publish interval for."""
+        if user_input is not None:
+            self._sensor = user_input[CONF_SENSOR]
+            return await self.async_step_sensor_filter()
+
+        return self.async_show_form(step_id="sensor", data_schema=SENSOR_SCHEMA)
+
+    async def async_step_sensor_filter(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Configure deadband and publish interval of selected sensor."""
+        sensor_filters = dict(self._config_entry.options.get(CONF_SENSOR_FILTERS, {}))
+
+        if user_input is not None:
+            sensor_filters[self._sensor] = user_input
+            return self.async_create_entry(
+                data={**self._config_entry.options, CONF_SENSOR_FILTERS: sensor_filters}
+            )
+
+        return self.async_show_form(
+            step_id="sensor_filter",
+            data_schema=self.add_suggested_values_to_schema(
+                SENSOR_FILTER_SCHEMA, sensor_filters.get(self._sensor, {})
+            ),
+            description_placeholders={"sensor": FILTERABLE_SENSORS[self._sensor]},
+        )
@@ -1,5 +1,6 @@
 """Constants for saleryd_hrv."""
 
+from datetime import timedelta
 from enum import IntEnum
 from logging import Logger, getLogger
 
@@ -34,10 +35,72 @@ CONF_WEBSOCKET_PORT = "websocket_port"
 CONF_INSTALLER_PASSWORD = "installer_password"
 CONF_ENABLE_INSTALLER_SETTINGS = "enable_installer_settings"
 CONF_VALUE = "value"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_CAPTURE = "capture"
+CONF_AUTH_TIMEOUT = "auth_timeout"
+CONF_CONFIRM_TIMEOUT = "confirm_timeout"
+CONF_LAZY_STARTUP = "lazy_startup"
+CONF_STATISTICS = "statistics"
+CONF_ROLLING_STATISTICS = "rolling_statistics"
+CONF_SENSOR = "sensor"
+CONF_SENSOR_FILTERS = "sensor_filters"
+CONF_DEADBAND_ABSOLUTE = "deadband_absolute"
+CONF_DEADBAND_PERCENT = "deadband_percent"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
 
 # Defaults
 DEFAULT_NAME = DOMAIN
 
+# Connection
+CONNECT_TIMEOUT = 10
+CONNECTION_CHECK_INTERVAL = timedelta(seconds=1)
+CONNECTION_POLL_INTERVAL = 0.2
+BACKOFF_INITIAL = 1
+BACKOFF_MAX = 60
+
+# Optimistic state of controls is rolled back unless received within this time,
+# or within the command confirmation timeout when configured
+OPTIMISTIC_STATE_TIMEOUT = timedelta(seconds=10)
+
+# Capture of websocket traffic, written to the configuration directory
+CAPTURE_FILENAME = f"{DOMAIN}_capture_{{entry_id}}.jsonl"
+CAPTURE_QUEUE_SIZE = 1000
+
+# Persisted last known data and totals, written at most once per save delay
+STORAGE_VERSION = 1
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.snapshot"
+SNAPSHOT_SAVE_DELAY = 60
+TOTALS_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.totals"
+
+# Rates held for longer than this many seconds, e.g. while disconnected, are not
+# accumulated into totals, such as energy and runtime, or sampled into rolling windows
+TOTALS_MAX_INTERVAL = 120
+# Time constant in seconds of moving averages of derived sensors
+AVERAGE_TIME_CONSTANT = 900
+
+# Long-term statistics of measurements aggregated in the integration, imported at
+# this second past each hour. Measurement states are published once per period
+STATISTICS_PERIOD = timedelta(minutes=5)
+STATISTICS_IMPORT_SECOND = 10
+
+# Rolling windows of measurements by name, in seconds, kept in fixed time slots
+ROLLING_WINDOWS = {"1 min": 60, "15 min": 900, "1 h": 3600}
+ROLLING_SLOTS = 12
+# Values held between updates are sampled for rolling windows at this interval
+ROLLING_SAMPLE_INTERVAL = 5
+
+# Sensors with configurable deadband and publish interval, by unique id suffix
+FILTERABLE_SENSORS = {
+    "heat_exchanger_rotor_speed": "Heat exchanger rotor speed",
+    "heat_exchanger_rotor_speed_percent": "Heat exchanger rotor speed percent",
+    "supply_air_temperature": "Supply air temperature",
+    "heater_air_temperature": "Heater air temperature",
+    "heater_power_percent": "Heater power percent",
+    "heater_power": "Heater power",
+    "supply_fan_speed": "Supply fan speed",
+    "extract_fan_speed": "Extract fan speed",
+}
+
 # Messages
 STARTUP_MESSAGE = f"""
 -------------------------------------------------------------------
@@ -52,6 +115,17 @@ If encounter any problems open an issue here:
 KEY_CLIENT_STATE = "*HRV_CLIENT_STATE"
 KEY_TARGET_TEMPERATURE = "*TARGET_TEMPERATURE"
 KEY_COOKING_MODE = "*COOKING_MODE"
+KEY_HEATER_ENERGY = "*HEATER_ENERGY"
+KEY_HEATER_RUNTIME = "*HEATER_RUNTIME"
+KEY_SUPPLY_FAN_HOURS = "*SUPPLY_FAN_HOURS"
+KEY_EXTRACT_FAN_HOURS = "*EXTRACT_FAN_HOURS"
+KEY_BOOST_MODE_MINUTES = "*BOOST_MODE_MINUTES"
+KEY_FIREPLACE_MODE_MINUTES = "*FIREPLACE_MODE_MINUTES"
+KEY_HEATER_TEMPERATURE_RISE = "*HEATER_TEMPERATURE_RISE"
+KEY_SUPPLY_TEMPERATURE_AVERAGE = "*SUPPLY_TEMPERATURE_AVERAGE"
+KEY_HEATER_POWER_AVERAGE = "*HEATER_POWER_AVERAGE"
+# Time the restored snapshot was saved, until data is received from the client
+KEY_SNAPSHOT_RESTORED = "*SNAPSHOT_RESTORED"
 
 
 class TemperatureModeEnum(IntEnum):
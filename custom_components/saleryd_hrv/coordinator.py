@@ -1,13 +1,15 @@
 """Data update coordinator"""
 
+from functools import partial
 from logging import Logger
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from pysaleryd.const import DataKeyEnum
 
 from .const import DOMAIN, KEY_CLIENT_STATE, KEY_TARGET_TEMPERATURE
+from .snapshot import SalerydLokeSnapshot
 
 if TYPE_CHECKING:
     from .data import SalerydLokeConfigEntry
@@ -21,7 +23,79 @@ class SalerydLokeDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(self, hass: HomeAssistant, logger: Logger) -> None:
         """Initialize."""
         super().__init__(hass, logger, name=DOMAIN)
+        # Keys changed by the update currently being dispatched, None means all keys
+        self.changed_keys: frozenset[str] | None = None
+        self._key_listeners: dict[str, list[CALLBACK_TYPE]] = {}
 
     async def _async_update_data(self):
         """Fetch the latest data from the source."""
-        return self.data or dict()
+        return self.data or SalerydLokeSnapshot()
+
+    @callback
+    def async_set_changed_data(
+        self, data: SalerydLokeSnapshot, changed_keys: frozenset[str]
+    ):
+        """Update data and notify listeners of the keys that changed"""
+        # listeners must re-render on recovery, since availability changed
+        self.changed_keys = changed_keys if self.last_update_success else None
+        try:
+            self.async_set_updated_data(data)
+        finally:
+            self.changed_keys = None
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates
+
+        Entities pass the data keys they are rendered from as context, and are only
+        updated when one of their keys changed.
+        """
+        if not isinstance(context, tuple):
+            return super().async_add_listener(update_callback, context)
+        remove_listeners = [
+            self.async_add_key_listener(key, update_callback) for key in context
+        ]
+
+        @callback
+        def remove_listener() -> None:
+            for remove in remove_listeners:
+                remove()
+
+        return remove_listener
+
+    @callback
+    def async_add_key_listener(
+        self, key: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for updates of a single data key"""
+        self._key_listeners.setdefault(key, []).append(update_callback)
+        return partial(self.__async_remove_key_listener, key, update_callback)
+
+    @callback
+    def __async_remove_key_listener(
+        self, key: str, update_callback: CALLBACK_TYPE
+    ) -> None:
+        """Remove key listener"""
+        listeners = self._key_listeners[key]
+        listeners.remove(update_callback)
+        if not listeners:
+            del self._key_listeners[key]
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, key listeners are only updated if their key changed"""
+        super().async_update_listeners()
+        if self.changed_keys is None:
+            keys = self._key_listeners.keys()
+        else:
+            keys = self.changed_keys & self._key_listeners.keys()
+        # listeners of several changed keys are only called once
+        update_callbacks = dict.fromkeys(
+            update_callback
+            for key in keys
+            for update_callback in self._key_listeners[key]
+        )
+        for update_callback in update_callbacks:
+            update_callback()
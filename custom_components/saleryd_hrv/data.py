@@ -7,11 +7,15 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers.device_registry import DeviceInfo
     from homeassistant.loader import Integration
     from pysaleryd.client import Client
 
     from .bridge import SalerydLokeBridge
     from .coordinator import SalerydLokeDataUpdateCoordinator
+    from .metrics import SalerydLokeMetrics
+    from .rolling import SalerydLokeRollingStatistics
+    from .statistics import SalerydLokeStatistics
 
 
 type SalerydLokeConfigEntry = ConfigEntry[SalerydLokeData]
@@ -21,7 +25,11 @@ type SalerydLokeConfigEntry = ConfigEntry[SalerydLokeData]
 class SalerydLokeData:
     """Data for the integration."""
 
-    client: Client
+    client: Client | None
     coordinator: SalerydLokeDataUpdateCoordinator
     integration: Integration
     bridge: SalerydLokeBridge
+    device_info: DeviceInfo
+    metrics: SalerydLokeMetrics
+    statistics: SalerydLokeStatistics | None = None
+    rolling: SalerydLokeRollingStatistics | None = None
@@ -0,0 +1,294 @@
+"""Values derived from data of the HRV system"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+import math
+from typing import TYPE_CHECKING, Any
+
+from pysaleryd.const import DataKeyEnum
+
+from .const import (
+    AVERAGE_TIME_CONSTANT,
+    KEY_BOOST_MODE_MINUTES,
+    KEY_EXTRACT_FAN_HOURS,
+    KEY_FIREPLACE_MODE_MINUTES,
+    KEY_HEATER_ENERGY,
+    KEY_HEATER_POWER_AVERAGE,
+    KEY_HEATER_RUNTIME,
+    KEY_HEATER_TEMPERATURE_RISE,
+    KEY_SUPPLY_FAN_HOURS,
+    KEY_SUPPLY_TEMPERATURE_AVERAGE,
+    TOTALS_MAX_INTERVAL,
+    HeaterModeEnum,
+    HeaterPowerEnum,
+    ModeEnum,
+    VentilationModeEnum,
+)
+
+if TYPE_CHECKING:
+    from .snapshot import SalerydLokeSnapshot
+
+_MISSING = object()
+
+
+def get_heater_power_rating(heater_mode: Any) -> int | None:
+    """Heater power rating in W, from the heater power rating mode"""
+    if heater_mode == HeaterModeEnum.Low:
+        return HeaterPowerEnum.Low
+    if heater_mode == HeaterModeEnum.High:
+        return HeaterPowerEnum.High
+    return None
+
+
+def get_heater_power(heater_power_percent: Any, heater_mode: Any) -> float | None:
+    """Estimated heater power in W, from heater power percent and rating mode"""
+    power_rating = get_heater_power_rating(heater_mode)
+    if heater_power_percent is None or power_rating is None:
+        return None
+    return heater_power_percent / 100 * power_rating
+
+
+def get_snapshot_heater_power(snapshot: SalerydLokeSnapshot) -> float | None:
+    """Estimated heater power in W of snapshot"""
+    return get_heater_power(
+        snapshot.get_property(DataKeyEnum.HEATER_POWER_PERCENT).value,
+        snapshot.get_property(DataKeyEnum.MODE_HEATER_POWER_RATING).value,
+    )
+
+
+def _get_percent_rate(key: str, snapshot: SalerydLokeSnapshot) -> float | None:
+    value = snapshot.get_property(key).value
+    return value / 100 if isinstance(value, (int, float)) else None
+
+
+def _get_mode_rate(key: str, mode: int, snapshot: SalerydLokeSnapshot) -> float:
+    return 1 if snapshot.get_property(key).value == mode else 0
+
+
+def _get_heater_runtime_rate(snapshot: SalerydLokeSnapshot) -> float:
+    value = snapshot.get_property(DataKeyEnum.HEATER_POWER_PERCENT).value
+    return 1 if isinstance(value, (int, float)) and value > 0 else 0
+
+
+@dataclass(frozen=True, slots=True)
+class SalerydLokeTotal:
+    """Total accumulated from a rate of a snapshot, per second times scale"""
+
+    key: str
+    rate_fn: Callable[[SalerydLokeSnapshot], float | None]
+    scale: float
+    ndigits: int
+
+
+TOTALS = (
+    # kWh
+    SalerydLokeTotal(
+        key=KEY_HEATER_ENERGY,
+        rate_fn=get_snapshot_heater_power,
+        scale=1 / 3_600_000,
+        ndigits=3,
+    ),
+    # hours
+    SalerydLokeTotal(
+        key=KEY_HEATER_RUNTIME,
+        rate_fn=_get_heater_runtime_rate,
+        scale=1 / 3600,
+        ndigits=2,
+    ),
+    # hours weighted by fan speed
+    SalerydLokeTotal(
+        key=KEY_SUPPLY_FAN_HOURS,
+        rate_fn=partial(_get_percent_rate, DataKeyEnum.FAN_SPEED_SUPPLY),
+        scale=1 / 3600,
+        ndigits=2,
+    ),
+    SalerydLokeTotal(
+        key=KEY_EXTRACT_FAN_HOURS,
+        rate_fn=partial(_get_percent_rate, DataKeyEnum.FAN_SPEED_EXHAUST),
+        scale=1 / 3600,
+        ndigits=2,
+    ),
+    # minutes
+    SalerydLokeTotal(
+        key=KEY_BOOST_MODE_MINUTES,
+        rate_fn=partial(
+            _get_mode_rate, DataKeyEnum.MODE_FAN, VentilationModeEnum.Boost
+        ),
+        scale=1 / 60,
+        ndigits=0,
+    ),
+    SalerydLokeTotal(
+        key=KEY_FIREPLACE_MODE_MINUTES,
+        rate_fn=partial(_get_mode_rate, DataKeyEnum.FIREPLACE_MODE, ModeEnum.On),
+        scale=1 / 60,
+        ndigits=0,
+    ),
+)
+
+
+class SalerydLokeTotals:
+    """Totals accumulated from rates held between frames, e.g. energy from power
+
+    The rates of a snapshot are held from the frame it was received in until the
+    next update. While connected, the client calls handlers at least every 30
+    seconds, also when values are unchanged, so every update while connected is
+    evidence that rates were held. Gaps longer than the max interval and time while
+    not connected are not accumulated. Totals are rounded, so they only change when
+    the change is significant.
+    """
+
+    def __init__(self) -> None:
+        self.totals: dict[str, float] = {total.key: 0.0 for total in TOTALS}
+        self.data: dict[str, float] = self.__round()
+        self._last_time: float | None = None
+
+    def restore(self, totals: dict[str, float]) -> None:
+        """Continue accumulating persisted totals"""
+        self.totals.update(
+            (key, value) for key, value in totals.items() if key in self.totals
+        )
+        self.data = self.__round()
+
+    def interrupt(self) -> None:
+        """Do not accumulate rates held until the next update, e.g. when disconnected"""
+        self._last_time = None
+
+    def update(self, snapshot: SalerydLokeSnapshot, now: float) -> None:
+        """Add rates of snapshot held since the previous update"""
+        if self._last_time is not None and now - self._last_time <= (
+            TOTALS_MAX_INTERVAL
+        ):
+            seconds = now - self._last_time
+            for total in TOTALS:
+                if rate := total.rate_fn(snapshot):
+                    self.totals[total.key] += rate * seconds * total.scale
+        self._last_time = now
+        self.data = self.__round()
+
+    def __round(self) -> dict[str, float]:
+        return {
+            total.key: round(self.totals[total.key], total.ndigits) for total in TOTALS
+        }
+
+
+@dataclass(slots=True)
+class SalerydLokeMovingAverage:
+    """Exponential moving average of a value held between frames
+
+    Each value is weighted by the time it was held, so the average does not depend
+    on how often frames are received.
+    """
+
+    time_constant: float = AVERAGE_TIME_CONSTANT
+    value: float | None = None
+    held_value: float | None = None
+    last_time: float | None = None
+
+    def interrupt(self) -> None:
+        """Do not add the value held until the next update, e.g. when disconnected"""
+        self.last_time = None
+
+    def update(self, value: float | None, now: float) -> float | None:
+        """Add value held since the previous update, return average"""
+        if not isinstance(value, (int, float)):
+            value = None
+        if self.held_value is not None and self.last_time is not None:
+            decay = math.exp(-(now - self.last_time) / self.time_constant)
+            self.value = self.held_value + (self.value - self.held_value) * decay
+        elif self.value is None and value is not None:
+            self.value = value
+        self.held_value = value
+        self.last_time = now
+        return self.value
+
+
+def get_heater_temperature_rise(snapshot: SalerydLokeSnapshot) -> float | None:
+    """Temperature rise in the heater, from the air temperature at the heater"""
+    supply = snapshot.get_property(DataKeyEnum.AIR_TEMPERATURE_SUPPLY).value
+    at_heater = snapshot.get_property(DataKeyEnum.AIR_TEMPERATURE_AT_HEATER).value
+    if not isinstance(supply, (int, float)) or not isinstance(at_heater, (int, float)):
+        return None
+    return round(supply - at_heater, 1)
+
+
+@dataclass(frozen=True, slots=True)
+class SalerydLokeDerivedValue:
+    """Value computed from parsed values of input keys"""
+
+    key: str
+    input_keys: frozenset[str]
+    value_fn: Callable[[SalerydLokeSnapshot], Any]
+
+
+DERIVED_VALUES = (
+    SalerydLokeDerivedValue(
+        key=KEY_HEATER_TEMPERATURE_RISE,
+        input_keys=frozenset(
+            {DataKeyEnum.AIR_TEMPERATURE_SUPPLY, DataKeyEnum.AIR_TEMPERATURE_AT_HEATER}
+        ),
+        value_fn=get_heater_temperature_rise,
+    ),
+)
+
+
+def _round(value: float | None, ndigits: int) -> float | None:
+    return None if value is None else round(value, ndigits)
+
+
+class SalerydLokeDerivedData:
+    """Values derived from snapshots, updated incrementally
+
+    Derived values are only computed when their input keys changed. Moving averages
+    are updated with every update while connected, also when values are unchanged,
+    and rounded so they only change when the change is significant.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self._heater_power_average = SalerydLokeMovingAverage()
+        self._supply_temperature_average = SalerydLokeMovingAverage()
+
+    def interrupt(self) -> None:
+        """Do not add values held until the next update, e.g. when disconnected"""
+        self._heater_power_average.interrupt()
+        self._supply_temperature_average.interrupt()
+
+    def update(
+        self,
+        snapshot: SalerydLokeSnapshot,
+        changed_keys: frozenset[str],
+        now: float | None,
+    ) -> frozenset[str]:
+        """Update derived values from snapshot, return keys that changed
+
+        Moving averages are interrupted when now is None, e.g. while not connected.
+        """
+        data = {
+            derived_value.key: derived_value.value_fn(snapshot)
+            for derived_value in DERIVED_VALUES
+            if derived_value.key not in self.data
+            or not derived_value.input_keys.isdisjoint(changed_keys)
+        }
+        if now is None:
+            self.interrupt()
+        else:
+            data[KEY_HEATER_POWER_AVERAGE] = _round(
+                self._heater_power_average.update(
+                    get_snapshot_heater_power(snapshot), now
+                ),
+                0,
+            )
+            data[KEY_SUPPLY_TEMPERATURE_AVERAGE] = _round(
+                self._supply_temperature_average.update(
+                    snapshot.get_property(DataKeyEnum.AIR_TEMPERATURE_SUPPLY).value, now
+                ),
+                1,
+            )
+        changed = frozenset(
+            key for key, value in data.items() if self.data.get(key, _MISSING) != value
+        )
+        self.data.update(data)
+        return changed
@@ -0,0 +1,31 @@
+"""Diagnostics support"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from pysaleryd.const import DataKeyEnum
+
+from .const import CONF_INSTALLER_PASSWORD
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import SalerydLokeConfigEntry
+
+TO_REDACT = {CONF_INSTALLER_PASSWORD, DataKeyEnum.INSTALLER_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: SalerydLokeConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "data": async_redact_data(dict(entry.runtime_data.coordinator.data), TO_REDACT),
+        "metrics": entry.runtime_data.metrics.as_dict(),
+    }
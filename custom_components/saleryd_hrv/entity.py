@@ -1,13 +1,19 @@
 """Entity"""
 
+import dataclasses
+from datetime import timedelta
+from typing import Any
+
 from homeassistant.config_entries import TYPE_CHECKING
-from homeassistant.const import CONF_NAME
-from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
-from .const import DOMAIN, MANUFACTURER
+from .const import CONF_CONFIRM_TIMEOUT, OPTIMISTIC_STATE_TIMEOUT
 from .coordinator import SalerydLokeDataUpdateCoordinator
+from .snapshot import SalerydLokeProperty
 
 if TYPE_CHECKING:
     from .data import SalerydLokeConfigEntry
@@ -25,32 +31,119 @@ class SaleryLokeVirtualEntity(Entity):
         self._attr_name = entity_description.name
         self._attr_unique_id = f"{entry.unique_id}_{slugify(entity_description.name)}"
         self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=entry.data.get(CONF_NAME),
-            manufacturer=MANUFACTURER,
-        )
+        self._attr_device_info = entry.runtime_data.device_info
 
 
 class SalerydLokeEntity(CoordinatorEntity):
     """Entity base class"""
 
+    _last_rendered_state: tuple | None = None
+    _optimistic_property: SalerydLokeProperty | None = None
+    _unsub_rollback: CALLBACK_TYPE | None = None
+
     def __init__(
         self,
         coordinator: SalerydLokeDataUpdateCoordinator,
         entry: "SalerydLokeConfigEntry",
         entity_description: EntityDescription,
     ) -> None:
-        super().__init__(coordinator)
-        self._entry = entry
         self.entity_description = entity_description
+        # the coordinator only updates the entity when one of its data keys changed
+        super().__init__(coordinator, self.data_keys)
+        self._entry = entry
         self._attr_name = entity_description.name
         self._attr_unique_id = f"{entry.entry_id}_{slugify(entity_description.name)}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=entry.data.get(CONF_NAME),
-            manufacturer=MANUFACTURER,
+        self._attr_device_info = entry.runtime_data.device_info
+        # optimistic state is kept for as long as commands are waiting for confirmation
+        confirm_timeout = entry.options.get(CONF_CONFIRM_TIMEOUT, 0)
+        self._rollback_delay = (
+            timedelta(seconds=confirm_timeout)
+            if confirm_timeout
+            else OPTIMISTIC_STATE_TIMEOUT
         )
 
+    @property
+    def data_keys(self) -> tuple[str, ...]:
+        """Data keys the entity state is rendered from"""
+        return (self.entity_description.key,)
+
+    async def async_added_to_hass(self) -> None:
+        """Render the initial state"""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.__cancel_rollback)
+        self._last_rendered_state = self._render_state()
+
+    def _render_state(self) -> tuple:
+        """Render the parts of the entity state that change with data"""
+        return (self.available, self.state, self.extra_state_attributes)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, skip write if state is unchanged"""
+        if (
+            self._optimistic_property is not None
+            and self.coordinator.data.get_property(self.entity_description.key).value
+            == self._optimistic_property.value
+        ):
+            # optimistic value has been received from the unit
+            self.__cancel_rollback()
+            self._optimistic_property = None
+        rendered_state = self._render_state()
+        if rendered_state == self._last_rendered_state and not self.force_update:
+            return
+        self._last_rendered_state = rendered_state
+        super()._handle_coordinator_update()
+
+    def get_property(self, key: str | None = None) -> SalerydLokeProperty:
+        """Get parsed value of key, defaults to the entity description key"""
+        if self._optimistic_property is not None and key in (
+            None,
+            self.entity_description.key,
+        ):
+            return self._optimistic_property
+        return self.coordinator.data.get_property(key or self.entity_description.key)
+
+    async def async_send_command(self, value: Any, auth: bool = False) -> None:
+        """Send command for the entity key, showing the new value right away
+
+        The new value is rolled back if the command fails, is not confirmed or the
+        value is not received from the unit in time.
+        """
+        self.__set_optimistic(value)
+        try:
+            confirmed = await self._entry.runtime_data.bridge.send_command(
+                self.entity_description.key, value, auth
+            )
+        except Exception:
+            self.__rollback()
+            raise
+        if not confirmed:
+            self.__rollback()
+
+    def __set_optimistic(self, value: Any) -> None:
+        self.__cancel_rollback()
+        self._optimistic_property = dataclasses.replace(
+            self.coordinator.data.get_property(self.entity_description.key),
+            value=value,
+        )
+        self._unsub_rollback = async_call_later(
+            self.hass, self._rollback_delay, self.__rollback
+        )
+        self._handle_coordinator_update()
+
+    @callback
+    def __rollback(self, _now=None) -> None:
+        """Show the value last received from the unit"""
+        self.__cancel_rollback()
+        if self._optimistic_property is not None:
+            self._optimistic_property = None
+            self._handle_coordinator_update()
+
+    @callback
+    def __cancel_rollback(self) -> None:
+        if self._unsub_rollback:
+            self._unsub_rollback()
+            self._unsub_rollback = None
+
     def get_value(self):
         return self.coordinator.data.get(self.entity_description.key, None)
@@ -0,0 +1,212 @@
+"""Performance metrics"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import math
+import time
+from typing import Any
+
+# Upper bounds of latency buckets in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Upper bounds of duration buckets in seconds
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 900)
+# Upper bounds of dispatch time buckets in seconds
+DISPATCH_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+# Rates are averaged over a sliding window in seconds, kept in fixed time slots
+RATE_WINDOW = 300
+RATE_SLOTS = 10
+
+
+@dataclass(slots=True)
+class SalerydLokeHistogram:
+    """Histogram with fixed bucket upper bounds, and a bucket for larger values"""
+
+    bounds: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(init=False)
+    count: int = 0
+    total: float = 0
+    max_value: float = 0
+    last_value: float | None = None
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    def record(self, value: float) -> None:
+        """Record value"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max_value = max(self.max_value, value)
+        self.last_value = value
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of recorded values"""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Estimate percentile as the upper bound of the bucket it falls in"""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= max(rank, 1):
+                return min(bound, self.max_value)
+        return self.max_value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return histogram as dict"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max_value,
+            "last": self.last_value,
+            "buckets": {
+                f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)
+            }
+            | {"le_inf": self.counts[-1]},
+        }
+
+
+class SalerydLokeSlotWindow:
+    """Sliding time window of fixed time slots
+
+    Slots are reused once they fall out of the window, so memory is fixed and
+    recording is constant time. Subclasses keep the values of each slot.
+    """
+
+    __slots__ = ("window", "slots", "_slot_ids")
+
+    def __init__(self, window: float, slots: int) -> None:
+        self.window = window
+        self.slots = slots
+        self._slot_ids = array("q", [-1] * slots)
+
+    def _get_slot(self, now: float | None) -> int:
+        """Index of the slot of now, reset if it was used by an earlier slot"""
+        slot_id = self.__slot_id(now)
+        index = slot_id % self.slots
+        if self._slot_ids[index] != slot_id:
+            self._slot_ids[index] = slot_id
+            self._reset_slot(index)
+        return index
+
+    def _get_window_slots(self, now: float | None) -> list[int]:
+        """Indexes of slots within the window"""
+        slot_id = self.__slot_id(now)
+        return [
+            index
+            for index, index_slot_id in enumerate(self._slot_ids)
+            if slot_id - index_slot_id < self.slots
+        ]
+
+    def _reset_slot(self, index: int) -> None:
+        raise NotImplementedError
+
+    def __slot_id(self, now: float | None) -> int:
+        if now is None:
+            now = time.monotonic()
+        return int(now * self.slots // self.window)
+
+
+class SalerydLokeRate(SalerydLokeSlotWindow):
+    """Rate of events over a sliding window, summed in time slots"""
+
+    __slots__ = ("total", "_amounts")
+
+    def __init__(self, window: float = RATE_WINDOW, slots: int = RATE_SLOTS) -> None:
+        super().__init__(window, slots)
+        self.total: float = 0
+        self._amounts = array("d", [0] * slots)
+
+    def record(self, amount: float = 1, now: float | None = None) -> None:
+        """Record amount"""
+        self._amounts[self._get_slot(now)] += amount
+        self.total += amount
+
+    def rate(self, now: float | None = None) -> float:
+        """Amount per second over the window"""
+        return (
+            sum(self._amounts[index] for index in self._get_window_slots(now))
+            / self.window
+        )
+
+    def _reset_slot(self, index: int) -> None:
+        self._amounts[index] = 0
+
+
+@dataclass(slots=True)
+class SalerydLokeMetrics:
+    """Metrics of communication with the HRV system"""
+
+    commands_sent: int = 0
+    commands_confirmed: int = 0
+    commands_timed_out: int = 0
+    command_latency: SalerydLokeHistogram = field(default_factory=SalerydLokeHistogram)
+    disconnects: int = 0
+    reconnects: int = 0
+    connect_failures: int = 0
+    disconnect_duration: SalerydLokeHistogram = field(
+        default_factory=lambda: SalerydLokeHistogram(DURATION_BUCKETS)
+    )
+    frames: SalerydLokeRate = field(default_factory=SalerydLokeRate)
+    # estimated from changed values, the client does not expose received messages
+    bytes_received: SalerydLokeRate = field(default_factory=SalerydLokeRate)
+    key_updates: dict[str, SalerydLokeRate] = field(default_factory=dict)
+    last_frame_at: float | None = None
+    dispatch_time: SalerydLokeHistogram = field(
+        default_factory=lambda: SalerydLokeHistogram(DISPATCH_BUCKETS)
+    )
+
+    def record_frame(self, now: float) -> None:
+        """Record frame received from the client"""
+        self.frames.record(1, now)
+        self.last_frame_at = now
+
+    def record_key_update(self, key: str, value: Any, now: float) -> None:
+        """Record updated key, estimating the size of the message it was sent in"""
+        if (rate := self.key_updates.get(key)) is None:
+            rate = self.key_updates[key] = SalerydLokeRate()
+        rate.record(1, now)
+        # messages are formatted as #KEY:VALUE\r
+        self.bytes_received.record(len(key) + len(str(value)) + 3, now)
+
+    @property
+    def last_frame_age(self) -> float | None:
+        """Seconds since the last frame was received"""
+        if self.last_frame_at is None:
+            return None
+        return time.monotonic() - self.last_frame_at
+
+    def key_update_rates(self) -> dict[str, float]:
+        """Updates per minute of keys updated within the rate window"""
+        now = time.monotonic()
+        rates = {key: rate.rate(now) * 60 for key, rate in self.key_updates.items()}
+        return {key: round(rate, 3) for key, rate in rates.items() if rate}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return metrics as dict"""
+        return {
+            "commands_sent": self.commands_sent,
+            "commands_confirmed": self.commands_confirmed,
+            "commands_timed_out": self.commands_timed_out,
+            "command_latency": self.command_latency.as_dict(),
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "connect_failures": self.connect_failures,
+            "disconnect_duration": self.disconnect_duration.as_dict(),
+            "frames": self.frames.total,
+            "frame_rate": self.frames.rate(),
+            "estimated_bytes_received": self.bytes_received.total,
+            "estimated_byte_rate": self.bytes_received.rate(),
+            "last_frame_age": self.last_frame_age,
+            "key_update_rates": self.key_update_rates(),
+            "dispatch_time": self.dispatch_time.as_dict(),
+        }
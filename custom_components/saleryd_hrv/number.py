@@ -10,10 +10,10 @@ from homeassistant.const import UnitOfTemperature
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util import slugify
 from pysaleryd.const import DataKeyEnum
-from pysaleryd.utils import SystemProperty
 
 from .const import CONF_ENABLE_INSTALLER_SETTINGS
 from .entity import SalerydLokeEntity
+from .snapshot import SalerydLokeProperty
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -39,21 +39,15 @@ class SalerydLokeNumber(SalerydLokeEntity, NumberEntity):
         self.entity_id = f"number.{entry.unique_id}_{slugify(entity_description.name)}"
         super().__init__(coordinator, entry, entity_description)
 
-    def _get_native_value(self, system_property: SystemProperty):
+    def _get_native_value(self, system_property: SalerydLokeProperty):
         return system_property.value
 
     @property
     def native_value(self):
-        system_property = SystemProperty.from_str(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key),
-        )
-        return self._get_native_value(system_property)
+        return self._get_native_value(self.get_property())
 
     async def async_set_native_value(self, value):
-        await self._entry.runtime_data.bridge.send_command(
-            self.entity_description.key, int(value)
-        )
+        await self.async_send_command(int(value))
 
 
 async def async_setup_entry(
@@ -0,0 +1,144 @@
+"""Rolling window statistics of measurements"""
+
+from __future__ import annotations
+
+from array import array
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
+from pysaleryd.const import DataKeyEnum
+
+from .const import (
+    ROLLING_SAMPLE_INTERVAL,
+    ROLLING_SLOTS,
+    ROLLING_WINDOWS,
+    TOTALS_MAX_INTERVAL,
+)
+from .metrics import SalerydLokeSlotWindow
+
+if TYPE_CHECKING:
+    from .snapshot import SalerydLokeSnapshot
+
+# Numeric keys with rolling windows
+ROLLING_KEYS = (
+    DataKeyEnum.AIR_TEMPERATURE_SUPPLY,
+    DataKeyEnum.AIR_TEMPERATURE_AT_HEATER,
+    DataKeyEnum.FAN_SPEED_SUPPLY,
+    DataKeyEnum.FAN_SPEED_EXHAUST,
+    DataKeyEnum.HEAT_EXCHANGER_ROTOR_PERCENT,
+    DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM,
+    DataKeyEnum.HEATER_POWER_PERCENT,
+)
+
+
+class SalerydLokeRollingWindow(SalerydLokeSlotWindow):
+    """Mean, min, max and standard deviation of values over a sliding time window"""
+
+    __slots__ = ("_counts", "_sums", "_squares", "_mins", "_maxs")
+
+    def __init__(self, window: float, slots: int = ROLLING_SLOTS) -> None:
+        super().__init__(window, slots)
+        self._counts = array("q", [0] * slots)
+        self._sums = array("d", [0] * slots)
+        self._squares = array("d", [0] * slots)
+        self._mins = array("d", [math.inf] * slots)
+        self._maxs = array("d", [-math.inf] * slots)
+
+    def record(self, value: float, now: float) -> None:
+        """Record value"""
+        index = self._get_slot(now)
+        self._counts[index] += 1
+        self._sums[index] += value
+        self._squares[index] += value * value
+        self._mins[index] = min(self._mins[index], value)
+        self._maxs[index] = max(self._maxs[index], value)
+
+    def get_statistics(self, now: float) -> dict[str, float] | None:
+        """Statistics of values within the window, None if there are none"""
+        count = 0
+        total = squares = 0.0
+        min_value, max_value = math.inf, -math.inf
+        for index in self._get_window_slots(now):
+            count += self._counts[index]
+            total += self._sums[index]
+            squares += self._squares[index]
+            min_value = min(min_value, self._mins[index])
+            max_value = max(max_value, self._maxs[index])
+        if not count:
+            return None
+        mean = total / count
+        return {
+            "mean": mean,
+            "min": min_value,
+            "max": max_value,
+            "stddev": math.sqrt(max(squares / count - mean * mean, 0)),
+            "count": count,
+        }
+
+    def _reset_slot(self, index: int) -> None:
+        self._counts[index] = 0
+        self._sums[index] = 0
+        self._squares[index] = 0
+        self._mins[index] = math.inf
+        self._maxs[index] = -math.inf
+
+
+class SalerydLokeRollingStatistics:
+    """Rolling windows of numeric keys, sampled at a fixed interval
+
+    Values of a snapshot are held from the frame it was received in until the next
+    update, and sampled once per sample interval while held, so the statistics do
+    not depend on how often frames are received. Like totals, time while not
+    connected and gaps longer than the max interval are not sampled.
+    """
+
+    def __init__(
+        self,
+        keys: tuple[str, ...] = ROLLING_KEYS,
+        windows: dict[str, float] = ROLLING_WINDOWS,
+        sample_interval: float = ROLLING_SAMPLE_INTERVAL,
+    ) -> None:
+        self._windows = {
+            key: {
+                name: SalerydLokeRollingWindow(seconds)
+                for name, seconds in windows.items()
+            }
+            for key in keys
+        }
+        self._sample_interval = sample_interval
+        self._last_time: float | None = None
+
+    def interrupt(self) -> None:
+        """Do not sample values held until the next update, e.g. when disconnected"""
+        self._last_time = None
+
+    def update(self, snapshot: SalerydLokeSnapshot, now: float) -> None:
+        """Sample values of snapshot held since the previous update"""
+        if self._last_time is not None and now - self._last_time <= (
+            TOTALS_MAX_INTERVAL
+        ):
+            first = math.floor(self._last_time / self._sample_interval) + 1
+            last = math.floor(now / self._sample_interval)
+            sample_times = [
+                sample * self._sample_interval for sample in range(first, last + 1)
+            ]
+            if sample_times:
+                self.__record(snapshot, sample_times)
+        self._last_time = now
+
+    def __record(self, snapshot: SalerydLokeSnapshot, sample_times: list[float]):
+        for key, windows in self._windows.items():
+            value = snapshot.get_property(key).value
+            if isinstance(value, (int, float)):
+                for window in windows.values():
+                    for sample_time in sample_times:
+                        window.record(value, sample_time)
+
+    def get_statistics(
+        self, key: str, window: str, now: float | None = None
+    ) -> dict[str, Any] | None:
+        """Statistics of key over window, by window name"""
+        if now is None:
+            now = time.monotonic()
+        return self._windows[key][window].get_statistics(now)
@@ -5,7 +5,6 @@ from homeassistant.components.select import SelectEntity, SelectEntityDescriptio
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util import slugify
 from pysaleryd.const import DataKeyEnum
-from pysaleryd.utils import SystemProperty
 
 from .const import (
     CONF_ENABLE_INSTALLER_SETTINGS,
@@ -32,27 +31,20 @@ class SalerydLokeSelect(SalerydLokeEntity, SelectEntity):
         entry: "SalerydLokeConfigEntry",
         entity_description: SelectEntityDescription,
     ):
-        self._attr_current_option = None
         self._entry = entry
         self._attr_options = [o.name for o in self.OPTION_ENUM]
         self.entity_id = f"select.{entry.unique_id}_{slugify(entity_description.name)}"
         super().__init__(coordinator, entry, entity_description)
 
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        system_property = SystemProperty.from_str(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key, None),
-        )
-        if system_property.value is not None:
-            self._attr_current_option = self.OPTION_ENUM(system_property.value).name
-        super()._handle_coordinator_update()
+    @property
+    def current_option(self) -> str | None:
+        """Return the selected option."""
+        value = self.get_property().value
+        return None if value is None else self.OPTION_ENUM(value).name
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        await self._entry.runtime_data.bridge.send_command(
-            self.entity_description.key, self.OPTION_ENUM[option]
-        )
+        await self.async_send_command(self.OPTION_ENUM[option])
 
 
 class SalerydLokeVentilationModeSelect(SalerydLokeSelect):
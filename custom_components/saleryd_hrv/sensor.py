@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from enum import IntEnum
+from functools import partial
+import math
+import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
@@ -14,31 +19,92 @@ from homeassistant.components.sensor import (
 from homeassistant.const import (
     PERCENTAGE,
     REVOLUTIONS_PER_MINUTE,
+    UnitOfDataRate,
+    UnitOfEnergy,
     UnitOfPower,
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import slugify
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.typing import StateType
+from homeassistant.util import dt as dt_util, slugify
 from pysaleryd.const import DataKeyEnum
-from pysaleryd.utils import ErrorSystemProperty, SystemProperty
 
 from .const import (
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_SENSOR_FILTERS,
+    FILTERABLE_SENSORS,
+    KEY_BOOST_MODE_MINUTES,
     KEY_CLIENT_STATE,
-    HeaterModeEnum,
-    HeaterPowerEnum,
+    KEY_EXTRACT_FAN_HOURS,
+    KEY_FIREPLACE_MODE_MINUTES,
+    KEY_HEATER_ENERGY,
+    KEY_HEATER_POWER_AVERAGE,
+    KEY_HEATER_RUNTIME,
+    KEY_HEATER_TEMPERATURE_RISE,
+    KEY_SUPPLY_FAN_HOURS,
+    KEY_SUPPLY_TEMPERATURE_AVERAGE,
+    ROLLING_WINDOWS,
+    STATISTICS_PERIOD,
     ModeEnum,
     SystemActiveModeEnum,
     TemperatureModeEnum,
     VentilationModeEnum,
 )
-from .entity import SalerydLokeEntity
+from .derived import get_heater_power, get_heater_power_rating
+from .entity import SalerydLokeEntity, SaleryLokeVirtualEntity
+from .snapshot import SalerydLokeProperty
 
 if TYPE_CHECKING:
     from .coordinator import SalerydLokeDataUpdateCoordinator
-    from .data import SalerydLokeConfigEntry
+    from .data import SalerydLokeConfigEntry, SalerydLokeData
+    from .statistics import SalerydLokeStatisticsAggregator
+
+
+@dataclass
+class SalerydLokePublishFilter:
+    """Deadband and minimum interval between published sensor values"""
+
+    deadband_absolute: float = 0
+    deadband_percent: float = 0
+    min_publish_interval: float = 0
+    published_value: Any = None
+    published_at: float = -math.inf
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> SalerydLokePublishFilter:
+        """Create filter from sensor filter options"""
+        return cls(
+            deadband_absolute=options.get(CONF_DEADBAND_ABSOLUTE, 0),
+            deadband_percent=options.get(CONF_DEADBAND_PERCENT, 0),
+            min_publish_interval=options.get(CONF_MIN_PUBLISH_INTERVAL, 0),
+        )
+
+    def is_significant(self, value) -> bool:
+        """Return true if value is outside the deadband of the published value"""
+        if not isinstance(value, (int, float)) or not isinstance(
+            self.published_value, (int, float)
+        ):
+            return value != self.published_value
+        deadband = max(
+            self.deadband_absolute,
+            abs(self.published_value) * self.deadband_percent / 100,
+        )
+        return abs(value - self.published_value) >= deadband
+
+    def get_delay(self, now: float) -> float:
+        """Get seconds left until next value may be published"""
+        return max(self.published_at + self.min_publish_interval - now, 0)
+
+    def set_published(self, value, now: float) -> None:
+        """Record published value"""
+        self.published_value = value
+        self.published_at = now
 
 
 class SalerydLokeSensor(SalerydLokeEntity, SensorEntity):
@@ -52,65 +118,125 @@ class SalerydLokeSensor(SalerydLokeEntity, SensorEntity):
     ) -> None:
         """Initialize the sensor."""
         self.entity_id = f"sensor.{entry.unique_id}_{slugify(entity_description.name)}"
+        sensor_filter = entry.options.get(CONF_SENSOR_FILTERS, {}).get(
+            slugify(entity_description.name)
+        )
+        self._publish_filter = (
+            SalerydLokePublishFilter.from_options(sensor_filter)
+            if sensor_filter is not None
+            else None
+        )
+        self._unsub_publish: CALLBACK_TYPE | None = None
+        self._statistics: SalerydLokeStatisticsAggregator | None = None
+        statistics = entry.runtime_data.statistics
+        if (
+            statistics is not None
+            and slugify(entity_description.name) in FILTERABLE_SENSORS
+        ):
+            self._statistics = statistics.async_get_aggregator(
+                entity_description.name,
+                entity_description.native_unit_of_measurement,
+            )
+            # the recorder would compile statistics of the same measurement
+            self._attr_state_class = None
+            # trends are kept by statistics, publish state less often
+            if self._publish_filter is None:
+                self._publish_filter = SalerydLokePublishFilter(
+                    min_publish_interval=STATISTICS_PERIOD.total_seconds()
+                )
         super().__init__(coordinator, entry, entity_description)
 
-    def _get_native_value(self, system_property: SystemProperty):
+    async def async_will_remove_from_hass(self) -> None:
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, applying the publish filter"""
+        if self._statistics is not None:
+            self._statistics.record(
+                self.native_value if self.available else None, dt_util.utcnow()
+            )
+        if self._publish_filter is None:
+            super()._handle_coordinator_update()
+            return
+
+        if self._unsub_publish is not None:
+            # latest value is written when scheduled publish runs
+            return
+
+        if self.available:
+            if not self._publish_filter.is_significant(self.native_value):
+                return
+            delay = self._publish_filter.get_delay(time.monotonic())
+            if delay > 0:
+                self._unsub_publish = async_call_later(
+                    self.hass, delay, self._async_scheduled_publish
+                )
+                return
+
+        self._publish()
+
+    @callback
+    def _async_scheduled_publish(self, _now) -> None:
+        self._unsub_publish = None
+        self._publish()
+
+    def _publish(self) -> None:
+        self._publish_filter.set_published(
+            self.native_value if self.available else None, time.monotonic()
+        )
+        super()._handle_coordinator_update()
+
+    def _get_native_value(self, system_property: SalerydLokeProperty):
         return system_property.value
 
     @property
     def native_value(self):
-        value = SystemProperty.from_str(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key),
-        )
-        return self._get_native_value(value)
+        return self._get_native_value(self.get_property())
 
     def _get_extra_state_attributes(
-        self, system_property: SystemProperty
+        self, system_property: SalerydLokeProperty
     ) -> dict[str, Any] | None:
         return None
 
     @property
     def extra_state_attributes(self):
-        value = SystemProperty.from_str(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key),
-        )
-        return self._get_extra_state_attributes(value)
+        return self._get_extra_state_attributes(self.get_property())
 
 
 class SalerydLokeEstimatedHeaterPowerSensor(SalerydLokeSensor):
 
-    def _get_native_value(self, heater_power_percent: SystemProperty):
-        heater_power_rating = SystemProperty.from_str(
-            DataKeyEnum.MODE_HEATER_POWER_RATING,
-            self.coordinator.data.get(DataKeyEnum.MODE_HEATER_POWER_RATING, None),
-        )
-
-        if heater_power_percent.value is not None:
-            if heater_power_rating.value == HeaterModeEnum.Low:
-                return heater_power_percent.value / 100 * HeaterPowerEnum.Low
-            if heater_power_rating == HeaterPowerEnum.High:
-                return heater_power_percent.value / 100 * HeaterPowerEnum.High
+    @property
+    def data_keys(self):
+        return (*super().data_keys, DataKeyEnum.MODE_HEATER_POWER_RATING)
 
-        return None
+    def _get_native_value(self, heater_power_percent: SalerydLokeProperty):
+        heater_power_rating = self.get_property(DataKeyEnum.MODE_HEATER_POWER_RATING)
+        return get_heater_power(heater_power_percent.value, heater_power_rating.value)
 
 
 class SalerydLokeHeaterPowerRatingSensor(SalerydLokeSensor):
 
     def _get_native_value(self, system_property):
-        if system_property.value == HeaterModeEnum.Low:
-            return HeaterPowerEnum.Low
-        if system_property.value == HeaterModeEnum.High:
-            return HeaterPowerEnum.High
-
-        return None
+        return get_heater_power_rating(system_property.value)
 
 
 class SalerydLokeTargetTemperatureSensor(SalerydLokeSensor):
     """Target temperature sensor"""
 
-    def _get_native_value(self, ventilation_mode: SystemProperty):
+    @property
+    def data_keys(self):
+        return (
+            *super().data_keys,
+            DataKeyEnum.TARGET_TEMPERATURE_NORMAL,
+            DataKeyEnum.TARGET_TEMPERATURE_ECONOMY,
+            DataKeyEnum.TARGET_TEMPERATURE_COOL,
+        )
+
+    def _get_native_value(self, ventilation_mode: SalerydLokeProperty):
         if ventilation_mode.value is None:
             return None
 
@@ -121,9 +247,7 @@ class SalerydLokeTargetTemperatureSensor(SalerydLokeSensor):
         elif ventilation_mode.value == TemperatureModeEnum.Cool:
             key = DataKeyEnum.TARGET_TEMPERATURE_COOL
 
-        return SystemProperty.from_str(
-            self.entity_description.key, self.coordinator.data.get(key, None)
-        ).value
+        return self.get_property(key).value
 
 
 class SalerydLokeMinutesLeftSensor(SalerydLokeSensor):
@@ -160,6 +284,231 @@ class SalerydLokeEnumSensor(SalerydLokeSensor):
         return [o.name for o in self.options_enum]
 
 
+@dataclass(frozen=True, kw_only=True)
+class SalerydLokeMetricSensorEntityDescription(SensorEntityDescription):
+    """Description of sensor of integration metrics"""
+
+    value_fn: Callable[[SalerydLokeData], StateType]
+    attributes_fn: Callable[[SalerydLokeData], dict[str, Any]] | None = None
+
+
+class SalerydLokeMetricSensor(SaleryLokeVirtualEntity, SensorEntity):
+    """Diagnostic sensor of integration metrics, polled"""
+
+    entity_description: SalerydLokeMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        entry: "SalerydLokeConfigEntry",
+        entity_description: SalerydLokeMetricSensorEntityDescription,
+    ) -> None:
+        self._entry = entry
+        self.entity_id = f"sensor.{entry.unique_id}_{slugify(entity_description.name)}"
+        super().__init__(entry, entity_description)
+        self._attr_should_poll = True
+
+    @property
+    def native_value(self):
+        return self.entity_description.value_fn(self._entry.runtime_data)
+
+    @property
+    def extra_state_attributes(self):
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._entry.runtime_data)
+
+
+def _to_milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else seconds * 1000
+
+
+METRIC_SENSORS = (
+    SalerydLokeMetricSensorEntityDescription(
+        key="disconnects",
+        icon="mdi:lan-disconnect",
+        name="Disconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.metrics.disconnects,
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="connect_failures",
+        icon="mdi:lan-pending",
+        name="Failed connection attempts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.metrics.connect_failures,
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="disconnect_duration",
+        icon="mdi:timer-alert",
+        name="Last disconnect duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.metrics.disconnect_duration.last_value,
+        attributes_fn=lambda data: {
+            "count": data.metrics.disconnect_duration.count,
+            "mean": data.metrics.disconnect_duration.mean,
+            "p95": data.metrics.disconnect_duration.percentile(95),
+            "max": data.metrics.disconnect_duration.max_value,
+        },
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="reconnects",
+        icon="mdi:lan-connect",
+        name="Reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.metrics.reconnects,
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="frame_rate",
+        icon="mdi:swap-vertical",
+        name="Frame rate",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.metrics.frames.rate(),
+        attributes_fn=lambda data: {"total": data.metrics.frames.total},
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="byte_rate",
+        icon="mdi:swap-vertical",
+        name="Estimated data rate",
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.metrics.bytes_received.rate(),
+        attributes_fn=lambda data: {"total": data.metrics.bytes_received.total},
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="last_frame_age",
+        icon="mdi:timer-sand",
+        name="Last frame age",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.metrics.last_frame_age,
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="key_update_rate",
+        icon="mdi:key-change",
+        name="Key update rate",
+        native_unit_of_measurement="updates/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: sum(data.metrics.key_update_rates().values()),
+        attributes_fn=lambda data: data.metrics.key_update_rates(),
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="command_queue_depth",
+        icon="mdi:tray-full",
+        name="Command queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.bridge.command_queue_depth,
+    ),
+    SalerydLokeMetricSensorEntityDescription(
+        key="dispatch_time",
+        icon="mdi:timer-outline",
+        name="Average dispatch time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: _to_milliseconds(data.metrics.dispatch_time.mean),
+        attributes_fn=lambda data: {
+            "count": data.metrics.dispatch_time.count,
+            "p95": _to_milliseconds(data.metrics.dispatch_time.percentile(95)),
+            "max": _to_milliseconds(data.metrics.dispatch_time.max_value),
+        },
+    ),
+)
+
+
+# Sensors of rolling windows, by key: name, device class and unit
+ROLLING_SENSORS = {
+    DataKeyEnum.AIR_TEMPERATURE_SUPPLY: (
+        "Supply air temperature",
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+    ),
+    DataKeyEnum.AIR_TEMPERATURE_AT_HEATER: (
+        "Heater air temperature",
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+    ),
+    DataKeyEnum.FAN_SPEED_SUPPLY: ("Supply fan speed", None, PERCENTAGE),
+    DataKeyEnum.FAN_SPEED_EXHAUST: ("Extract fan speed", None, PERCENTAGE),
+    DataKeyEnum.HEAT_EXCHANGER_ROTOR_PERCENT: (
+        "Heat exchanger rotor speed percent",
+        None,
+        PERCENTAGE,
+    ),
+    DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM: (
+        "Heat exchanger rotor speed",
+        None,
+        REVOLUTIONS_PER_MINUTE,
+    ),
+    DataKeyEnum.HEATER_POWER_PERCENT: ("Heater power percent", None, PERCENTAGE),
+}
+
+
+def _get_rolling_mean(key: str, window: str, data: SalerydLokeData) -> StateType:
+    statistics = data.rolling.get_statistics(key, window)
+    return None if statistics is None else statistics["mean"]
+
+
+def _get_rolling_attributes(
+    key: str, window: str, data: SalerydLokeData
+) -> dict[str, Any] | None:
+    statistics = data.rolling.get_statistics(key, window)
+    if statistics is None:
+        return None
+    return {
+        "min": statistics["min"],
+        "max": statistics["max"],
+        "stddev": round(statistics["stddev"], 2),
+        "count": statistics["count"],
+    }
+
+
+def get_rolling_sensor_descriptions() -> list[SalerydLokeMetricSensorEntityDescription]:
+    """Descriptions of mean sensors of each key and rolling window"""
+    return [
+        SalerydLokeMetricSensorEntityDescription(
+            key=f"{key}_{slugify(window)}_mean",
+            icon="mdi:chart-bell-curve",
+            name=f"{name} {window} mean",
+            device_class=device_class,
+            native_unit_of_measurement=unit,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=1,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=partial(_get_rolling_mean, key, window),
+            attributes_fn=partial(_get_rolling_attributes, key, window),
+        )
+        for key, (name, device_class, unit) in ROLLING_SENSORS.items()
+        for window in ROLLING_WINDOWS
+    ]
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: "SalerydLokeConfigEntry",
@@ -242,6 +591,128 @@ async def async_setup_entry(
                 native_unit_of_measurement=UnitOfPower.WATT,
             ),
         ),
+        # heater_energy
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_HEATER_ENERGY,
+                icon="mdi:lightning-bolt",
+                name="Heater energy",
+                device_class=SensorDeviceClass.ENERGY,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                suggested_display_precision=2,
+                native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            ),
+        ),
+        # heater_runtime
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_HEATER_RUNTIME,
+                icon="mdi:timer-outline",
+                name="Heater runtime",
+                device_class=SensorDeviceClass.DURATION,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                suggested_display_precision=1,
+                native_unit_of_measurement=UnitOfTime.HOURS,
+            ),
+        ),
+        # supply_fan_hours
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_SUPPLY_FAN_HOURS,
+                icon="mdi:fan-clock",
+                name="Supply fan hours",
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                suggested_display_precision=1,
+                native_unit_of_measurement=UnitOfTime.HOURS,
+            ),
+        ),
+        # extract_fan_hours
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_EXTRACT_FAN_HOURS,
+                icon="mdi:fan-clock",
+                name="Extract fan hours",
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                suggested_display_precision=1,
+                native_unit_of_measurement=UnitOfTime.HOURS,
+            ),
+        ),
+        # boost_mode_minutes
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_BOOST_MODE_MINUTES,
+                icon="mdi:timer-outline",
+                name="Boost mode duration",
+                device_class=SensorDeviceClass.DURATION,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                suggested_display_precision=0,
+                native_unit_of_measurement=UnitOfTime.MINUTES,
+            ),
+        ),
+        # fireplace_mode_minutes
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_FIREPLACE_MODE_MINUTES,
+                icon="mdi:timer-outline",
+                name="Fireplace mode duration",
+                device_class=SensorDeviceClass.DURATION,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                suggested_display_precision=0,
+                native_unit_of_measurement=UnitOfTime.MINUTES,
+            ),
+        ),
+        # heater_average_power
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_HEATER_POWER_AVERAGE,
+                icon="mdi:fuse-blade",
+                name="Heater average power",
+                device_class=SensorDeviceClass.POWER,
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=0,
+                native_unit_of_measurement=UnitOfPower.WATT,
+            ),
+        ),
+        # heater_temperature_rise
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_HEATER_TEMPERATURE_RISE,
+                icon="mdi:thermometer-chevron-up",
+                name="Heater temperature rise",
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=1,
+                native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+            ),
+        ),
+        # supply_air_average_temperature
+        SalerydLokeSensor(
+            coordinator,
+            entry,
+            entity_description=SensorEntityDescription(
+                key=KEY_SUPPLY_TEMPERATURE_AVERAGE,
+                name="Supply air average temperature",
+                device_class=SensorDeviceClass.TEMPERATURE,
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=1,
+                native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+            ),
+        ),
         # heater_power_rating
         SalerydLokeHeaterPowerRatingSensor(
             coordinator,
@@ -435,4 +906,14 @@ async def async_setup_entry(
         ),
     ]
 
+    sensors.extend(
+        SalerydLokeMetricSensor(entry, entity_description)
+        for entity_description in METRIC_SENSORS
+    )
+    if entry.runtime_data.rolling is not None:
+        sensors.extend(
+            SalerydLokeMetricSensor(entry, entity_description)
+            for entity_description in get_rolling_sensor_descriptions()
+        )
+
     async_add_entities(sensors)
@@ -0,0 +1,126 @@
+"""Parsed data snapshot"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from pysaleryd.utils import SystemProperty
+
+
+@dataclass(frozen=True, slots=True)
+class SalerydLokeProperty:
+    """Parsed value of a data key, with value, min, max"""
+
+    value: Any = None
+    min_value: Any = None
+    max_value: Any = None
+
+    @classmethod
+    def from_raw(cls, key: str, raw_value: Any) -> SalerydLokeProperty:
+        """Parse raw value"""
+        if raw_value is None or isinstance(raw_value, str):
+            system_property = SystemProperty.from_str(key, raw_value)
+            return cls(
+                system_property.value,
+                system_property.min_value,
+                system_property.max_value,
+            )
+        # values that are not strings, such as the error list, are kept as is
+        if isinstance(raw_value, list):
+            raw_value = tuple(raw_value)
+        return cls(raw_value)
+
+
+EMPTY_PROPERTY = SalerydLokeProperty()
+
+
+# Compact overlay into base when it exceeds this fraction of the base size
+OVERLAY_COMPACT_RATIO = 0.25
+
+_REMOVED = object()
+
+
+class SalerydLokeSnapshot(Mapping):
+    """Immutable snapshot of raw data, parsed once per frame
+
+    Entries of raw and parsed values are kept in a base dict shared between
+    snapshots, with changes kept in a small overlay. Evolving a snapshot copies the
+    overlay, not the base, which is only rebuilt once the overlay has grown large.
+    """
+
+    __slots__ = ("_base", "_overlay", "_len")
+
+    def __init__(
+        self,
+        base: dict[str, tuple[Any, SalerydLokeProperty]] | None = None,
+        overlay: dict[str, Any] | None = None,
+        length: int | None = None,
+    ) -> None:
+        self._base = base if base is not None else {}
+        self._overlay = overlay if overlay is not None else {}
+        self._len = len(self._base) if length is None else length
+
+    def __get_entry(self, key: str) -> tuple[Any, SalerydLokeProperty] | None:
+        entry = self._overlay.get(key)
+        if entry is None:
+            return self._base.get(key)
+        return None if entry is _REMOVED else entry
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self.__get_entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[0]
+
+    def __contains__(self, key) -> bool:
+        return self.__get_entry(key) is not None
+
+    def __iter__(self):
+        for key in self._base:
+            if key not in self._overlay:
+                yield key
+        for key, entry in self._overlay.items():
+            if entry is not _REMOVED:
+                yield key
+
+    def __len__(self) -> int:
+        return self._len
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.__get_entry(key)
+        return default if entry is None else entry[0]
+
+    def get_property(self, key: str) -> SalerydLokeProperty:
+        """Get parsed value of key"""
+        entry = self.__get_entry(key)
+        return EMPTY_PROPERTY if entry is None else entry[1]
+
+    def evolve(
+        self, data: Mapping[str, Any], changed_keys: Iterable[str]
+    ) -> SalerydLokeSnapshot:
+        """Create snapshot of new data, only parsing keys that changed"""
+        overlay = self._overlay.copy()
+        length = self._len
+        for key in changed_keys:
+            exists = self.__get_entry(key) is not None
+            if key in data:
+                raw_value = data[key]
+                overlay[key] = (raw_value, SalerydLokeProperty.from_raw(key, raw_value))
+                length += not exists
+            elif exists:
+                if key in self._base:
+                    overlay[key] = _REMOVED
+                else:
+                    del overlay[key]
+                length -= 1
+
+        if len(overlay) > len(self._base) * OVERLAY_COMPACT_RATIO:
+            base = {
+                key: entry
+                for key, entry in (self._base | overlay).items()
+                if entry is not _REMOVED
+            }
+            return SalerydLokeSnapshot(base)
+        return SalerydLokeSnapshot(self._base, overlay, length)
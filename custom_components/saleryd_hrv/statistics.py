@@ -0,0 +1,169 @@
+"""Long-term statistics of measurements, aggregated in the integration"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import math
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, STATISTICS_IMPORT_SECOND, STATISTICS_PERIOD
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+
+    MEAN_METADATA = {"mean_type": StatisticMeanType.ARITHMETIC}
+except ImportError:
+    # mean_type replaced has_mean in Home Assistant 2025.3
+    MEAN_METADATA = {"has_mean": True}
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import SalerydLokeConfigEntry
+
+
+@dataclass(slots=True)
+class SalerydLokeStatisticsBucket:
+    """Time weighted mean, min and max of a measurement during a period"""
+
+    weighted_total: float = 0
+    duration: float = 0
+    min_value: float = math.inf
+    max_value: float = -math.inf
+
+    def add(self, value: float, seconds: float) -> None:
+        """Add value held for seconds"""
+        self.weighted_total += value * seconds
+        self.duration += seconds
+        self.min_value = min(self.min_value, value)
+        self.max_value = max(self.max_value, value)
+
+
+class SalerydLokeStatisticsAggregator:
+    """Aggregate a measurement into buckets of the statistics period
+
+    Values are weighted by the time they were held, like statistics compiled by the
+    recorder. Buckets of completed hours are merged into hourly statistics.
+    """
+
+    __slots__ = ("metadata", "_value", "_since", "_buckets")
+
+    def __init__(self, metadata: StatisticMetaData) -> None:
+        self.metadata = metadata
+        self._value: float | None = None
+        self._since: datetime | None = None
+        self._buckets: dict[datetime, SalerydLokeStatisticsBucket] = {}
+
+    def record(self, value: float | None, now: datetime) -> None:
+        """Record value, held until the next recorded value"""
+        self.__accumulate(now)
+        self._value = value if isinstance(value, (int, float)) else None
+        self._since = now
+
+    def pop_hours(self, now: datetime) -> list[StatisticData]:
+        """Remove buckets of completed hours, returned as hourly statistics"""
+        self.__accumulate(now)
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        hours: dict[datetime, list[SalerydLokeStatisticsBucket]] = {}
+        for start in [start for start in self._buckets if start < hour_start]:
+            hours.setdefault(start.replace(minute=0), []).append(
+                self._buckets.pop(start)
+            )
+        statistics = []
+        for start, buckets in sorted(hours.items()):
+            duration = sum(bucket.duration for bucket in buckets)
+            if not duration:
+                continue
+            statistics.append(
+                StatisticData(
+                    start=start,
+                    mean=sum(bucket.weighted_total for bucket in buckets) / duration,
+                    min=min(bucket.min_value for bucket in buckets),
+                    max=max(bucket.max_value for bucket in buckets),
+                )
+            )
+        return statistics
+
+    def __accumulate(self, now: datetime) -> None:
+        """Add the held value to the buckets of the periods it was held in"""
+        start = self._since
+        self._since = now
+        if self._value is None or start is None:
+            return
+        period_minutes = STATISTICS_PERIOD.seconds // 60
+        while start < now:
+            bucket_start = start.replace(
+                minute=start.minute - start.minute % period_minutes,
+                second=0,
+                microsecond=0,
+            )
+            end = min(now, bucket_start + STATISTICS_PERIOD)
+            if (bucket := self._buckets.get(bucket_start)) is None:
+                bucket = self._buckets[bucket_start] = SalerydLokeStatisticsBucket()
+            bucket.add(self._value, (end - start).total_seconds())
+            start = end
+
+
+class SalerydLokeStatistics:
+    """Import aggregated measurements as external long-term statistics
+
+    The recorder only accepts imported statistics for whole hours, statistics are
+    imported shortly after each hour.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: SalerydLokeConfigEntry) -> None:
+        self.hass = hass
+        self._entry = entry
+        self._aggregators: dict[str, SalerydLokeStatisticsAggregator] = {}
+        self._unsub_import: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_get_aggregator(
+        self, name: str, unit_of_measurement: str | None
+    ) -> SalerydLokeStatisticsAggregator:
+        """Get aggregator of a measurement, by sensor name"""
+        object_id = slugify(f"{self._entry.unique_id}_{name}")
+        if (aggregator := self._aggregators.get(object_id)) is None:
+            aggregator = self._aggregators[object_id] = SalerydLokeStatisticsAggregator(
+                StatisticMetaData(
+                    **MEAN_METADATA,
+                    has_sum=False,
+                    name=f"{self._entry.data.get(CONF_NAME)} {name}",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:{object_id}",
+                    unit_of_measurement=unit_of_measurement,
+                )
+            )
+        return aggregator
+
+    @callback
+    def async_start(self) -> None:
+        """Import statistics of completed hours every hour"""
+        self._unsub_import = async_track_utc_time_change(
+            self.hass, self.__async_import, minute=0, second=STATISTICS_IMPORT_SECOND
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop importing, importing statistics of completed hours"""
+        if self._unsub_import:
+            self._unsub_import()
+            self._unsub_import = None
+        self.__async_import()
+
+    @callback
+    def __async_import(self, _now: datetime | None = None) -> None:
+        now = dt_util.utcnow()
+        for aggregator in self._aggregators.values():
+            if statistics := aggregator.pop_hours(now):
+                async_add_external_statistics(
+                    self.hass, aggregator.metadata, statistics
+                )
@@ -0,0 +1,122 @@
+"""Persisted data"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from pysaleryd.const import DataKeyEnum
+
+from .const import (
+    KEY_BOOST_MODE_MINUTES,
+    KEY_CLIENT_STATE,
+    KEY_EXTRACT_FAN_HOURS,
+    KEY_FIREPLACE_MODE_MINUTES,
+    KEY_HEATER_ENERGY,
+    KEY_HEATER_POWER_AVERAGE,
+    KEY_HEATER_RUNTIME,
+    KEY_HEATER_TEMPERATURE_RISE,
+    KEY_SNAPSHOT_RESTORED,
+    KEY_SUPPLY_FAN_HOURS,
+    KEY_SUPPLY_TEMPERATURE_AVERAGE,
+    KEY_TARGET_TEMPERATURE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    STORAGE_VERSION,
+    TOTALS_STORAGE_KEY,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Keys that are not persisted, virtual keys are derived from live state
+EXCLUDED_KEYS = {
+    KEY_CLIENT_STATE,
+    KEY_TARGET_TEMPERATURE,
+    KEY_SNAPSHOT_RESTORED,
+    KEY_HEATER_ENERGY,
+    KEY_HEATER_RUNTIME,
+    KEY_SUPPLY_FAN_HOURS,
+    KEY_EXTRACT_FAN_HOURS,
+    KEY_BOOST_MODE_MINUTES,
+    KEY_FIREPLACE_MODE_MINUTES,
+    KEY_HEATER_TEMPERATURE_RISE,
+    KEY_HEATER_POWER_AVERAGE,
+    KEY_SUPPLY_TEMPERATURE_AVERAGE,
+    DataKeyEnum.INSTALLER_PASSWORD,
+}
+
+
+class SalerydLokeStore:
+    """Data persisted across restarts, saved with a delay
+
+    Saves are delayed, so data is written at most once per save delay, on unload and
+    when Home Assistant stops. Data is serialized when it is written.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, key)
+        self._data: Mapping[str, Any] | None = None
+
+    @callback
+    def async_schedule_save(self, data: Mapping[str, Any]) -> None:
+        """Save data, unless a save is already scheduled"""
+        schedule = self._data is None
+        self._data = data
+        if schedule:
+            # rescheduling would postpone saves while data keeps arriving
+            self._store.async_delay_save(self.__data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write scheduled save right away"""
+        if self._data is not None:
+            await self._store.async_save(self.__data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove persisted data"""
+        await self._store.async_remove()
+
+    def _serialize(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Return data to write"""
+        return dict(data)
+
+    @callback
+    def __data_to_save(self) -> dict[str, Any]:
+        data, self._data = self._data, None
+        return self._serialize(data)
+
+
+class SalerydLokeSnapshotStore(SalerydLokeStore):
+    """Last known data of the HRV system"""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        super().__init__(hass, SNAPSHOT_STORAGE_KEY.format(entry_id=entry_id))
+
+    async def async_load(self) -> tuple[dict[str, Any], str] | None:
+        """Load data and the time it was saved, None if nothing has been saved"""
+        stored = await self._store.async_load()
+        if not stored:
+            return None
+        return stored["data"], stored["saved_at"]
+
+    def _serialize(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        return {
+            "saved_at": dt_util.utcnow().isoformat(),
+            "data": {
+                key: value for key, value in data.items() if key not in EXCLUDED_KEYS
+            },
+        }
+
+
+class SalerydLokeTotalsStore(SalerydLokeStore):
+    """Totals accumulated from data of the HRV system, such as heater energy"""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        super().__init__(hass, TOTALS_STORAGE_KEY.format(entry_id=entry_id))
+
+    async def async_load(self) -> dict[str, float]:
+        """Load totals, by name"""
+        return await self._store.async_load() or {}
@@ -0,0 +1,170 @@
+"""Connection supervisor"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import random
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_time_interval
+from pysaleryd.websocket import State
+
+from .const import (
+    BACKOFF_INITIAL,
+    BACKOFF_MAX,
+    CONNECT_TIMEOUT,
+    CONNECTION_CHECK_INTERVAL,
+    CONNECTION_POLL_INTERVAL,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pysaleryd.client import Client
+
+    from .metrics import SalerydLokeMetrics
+
+
+def get_backoff(attempt: int) -> float:
+    """Delay before a connection attempt, the first retry is immediate"""
+    if attempt == 0:
+        return 0
+    delay = min(BACKOFF_MAX, BACKOFF_INITIAL * 2 ** (attempt - 1))
+    # jitter spreads out reconnects, e.g. after the unit reboots
+    return random.uniform(delay / 2, delay)
+
+
+class SalerydLokeConnectionSupervisor:
+    """Reconnect to the HRV system with exponential backoff
+
+    The client retries lost connections at a fixed interval. The supervisor replaces
+    a client that lost its connection with a new one, retrying right away and then
+    backing off exponentially with jitter.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client_factory: Callable[[], Client],
+        metrics: SalerydLokeMetrics,
+    ) -> None:
+        self.hass = hass
+        self.metrics = metrics
+        self.client: Client | None = None
+        self._client_factory = client_factory
+        self._on_reconnect: Callable[[Client], None] | None = None
+        self._on_state_changed: Callable[[State], None] | None = None
+        self._task: asyncio.Task | None = None
+        self._unsub_check: CALLBACK_TYPE | None = None
+
+    async def async_connect(self, timeout: float) -> Client:
+        """Connect a client, retrying until timeout"""
+        async with asyncio.timeout(timeout):
+            return await self.__async_connect_with_backoff()
+
+    @callback
+    def async_start(
+        self,
+        client: Client | None,
+        on_reconnect: Callable[[Client], None],
+        on_state_changed: Callable[[State], None],
+    ) -> None:
+        """Supervise connection of client, on_reconnect is called with new clients
+
+        Without a client, the first client is connected in the background.
+        on_state_changed is called with the connection state when reconnecting
+        starts and ends, the replaced client does not report it.
+        """
+        self.client = client
+        self._on_reconnect = on_reconnect
+        self._on_state_changed = on_state_changed
+        self._unsub_check = async_track_time_interval(
+            self.hass,
+            self.__check_connection,
+            CONNECTION_CHECK_INTERVAL,
+            cancel_on_shutdown=True,
+        )
+        if client is None:
+            self.__start_reconnect()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop supervising connection"""
+        if self._unsub_check:
+            self._unsub_check()
+            self._unsub_check = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def __check_connection(self, _now=None) -> None:
+        # stopped clients have been disconnected on purpose
+        if self.client is not None and self.client.state == State.RETRYING:
+            self.__start_reconnect()
+
+    @callback
+    def __start_reconnect(self) -> None:
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self.__async_reconnect(), "saleryd_hrv reconnect"
+            )
+
+    async def __async_reconnect(self) -> None:
+        disconnected_at = time.monotonic()
+        if self.client is not None:
+            LOGGER.warning("Connection to HRV system lost, reconnecting")
+            self.metrics.disconnects += 1
+            # stop retries of the client at a fixed interval
+            self.client.disconnect()
+        self._on_state_changed(State.RETRYING)
+        try:
+            client = await self.__async_connect_with_backoff()
+        finally:
+            self._task = None
+
+        if self.client is not None:
+            duration = time.monotonic() - disconnected_at
+            LOGGER.info("Reconnected to HRV system after %.1f seconds", duration)
+            self.metrics.reconnects += 1
+            self.metrics.disconnect_duration.record(duration)
+            # keep last known data until the next update from the new client
+            client.data.update(self.client.data)
+        self.client = client
+        self._on_reconnect(client)
+        self._on_state_changed(client.state)
+
+    async def __async_connect_with_backoff(self) -> Client:
+        attempt = 0
+        while True:
+            client = self._client_factory()
+            try:
+                if await self.__async_connect(client):
+                    return client
+            except BaseException:
+                client.disconnect()
+                raise
+            client.disconnect()
+            self.metrics.connect_failures += 1
+            await asyncio.sleep(get_backoff(attempt))
+            attempt += 1
+
+    async def __async_connect(self, client: Client) -> bool:
+        """Connect client, fail as soon as the first connection attempt has failed"""
+        connect = self.hass.async_create_background_task(
+            client.connect(), "saleryd_hrv connect"
+        )
+        try:
+            async with asyncio.timeout(CONNECT_TIMEOUT):
+                while not connect.done():
+                    if client.state == State.RETRYING:
+                        return False
+                    await asyncio.sleep(CONNECTION_POLL_INTERVAL)
+        except TimeoutError:
+            return False
+        finally:
+            connect.cancel()
+        return True
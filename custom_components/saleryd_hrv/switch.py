@@ -13,7 +13,6 @@ from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import slugify
 from pysaleryd.const import DataKeyEnum
-from pysaleryd.utils import SystemProperty
 
 from .const import CONF_ENABLE_INSTALLER_SETTINGS, KEY_COOKING_MODE, LOGGER, ModeEnum
 from .entity import SalerydLokeEntity, SaleryLokeVirtualEntity
@@ -70,22 +69,13 @@ class SalerydLokeBinarySwitch(SalerydLokeEntity, SwitchEntity):
     @property
     def is_on(self):
         """Return true if the switch is on."""
-        system_property = SystemProperty.from_str(
-            self.entity_description.key,
-            self.coordinator.data.get(self.entity_description.key, None),
-        )
-
-        return system_property.value == self._state_when_on
+        return self.get_property().value == self._state_when_on
 
     async def async_turn_on(self, **kwargs):
-        await self._entry.runtime_data.bridge.send_command(
-            self.entity_description.key, self._state_when_on
-        )
+        await self.async_send_command(self._state_when_on)
 
     async def async_turn_off(self, **kwargs):
-        await self._entry.runtime_data.bridge.send_command(
-            self.entity_description.key, self._state_when_off
-        )
+        await self.async_send_command(self._state_when_off)
 
 
 class SalerydLokeCookingModeSwitch(SalerydLokeVirtualSwitch, RestoreEntity):
@@ -0,0 +1,81 @@
+"""Common helpers for tests."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from pysaleryd.websocket import State
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.saleryd_hrv.const import (
+    CONF_ENABLE_INSTALLER_SETTINGS,
+    CONF_INSTALLER_PASSWORD,
+    CONF_WEBSOCKET_IP,
+    CONF_WEBSOCKET_PORT,
+    CONFIG_VERSION,
+    DEFAULT_NAME,
+    DOMAIN,
+)
+
+MOCK_ENTRY_DATA = {
+    CONF_NAME: DEFAULT_NAME,
+    CONF_WEBSOCKET_IP: "127.0.0.1",
+    CONF_WEBSOCKET_PORT: 3001,
+    CONF_ENABLE_INSTALLER_SETTINGS: True,
+    CONF_INSTALLER_PASSWORD: "1234",
+}
+
+
+class FakeClient:
+    """Offline stand-in for pysaleryd Client."""
+
+    def __init__(self, url, port, session, update_interval=30):
+        self.state = State.NONE
+        self.data: dict[str, Any] = {}
+        self.commands: list[tuple[str, str | int]] = []
+        self._handlers = set()
+
+    async def connect(self):
+        self.state = State.RUNNING
+
+    def disconnect(self):
+        self.state = State.STOPPED
+
+    def add_handler(self, handler):
+        self._handlers.add(handler)
+
+    def remove_handler(self, handler):
+        self._handlers.remove(handler)
+
+    async def send_command(self, key, value):
+        self.commands.append((key, value))
+
+    def push_frame(self, frame: dict[str, Any]):
+        """Update data in place, like the client does, and call handlers."""
+        self.data.update(frame)
+        for handler in self._handlers:
+            handler(self.data)
+
+
+async def setup_integration(
+    hass: HomeAssistant,
+    options: dict[str, Any] | None = None,
+    entry_id: str | None = None,
+) -> tuple[MockConfigEntry, FakeClient]:
+    """Set up integration with all platforms, using a fake client."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=entry_id,
+        data=MOCK_ENTRY_DATA,
+        options=options or {},
+        version=CONFIG_VERSION,
+        unique_id=DEFAULT_NAME,
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.saleryd_hrv.Client", FakeClient):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry, entry.runtime_data.client
@@ -22,6 +22,20 @@ import pytest
 pytest_plugins = "pytest_homeassistant_custom_component"
 
 
+# Benchmarks are slow, they only run when requested with `--benchmark-only` or
+# `--benchmark-enable`.
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless requested."""
+    if config.getoption("benchmark_only", False) or config.getoption(
+        "benchmark_enable", False
+    ):
+        return
+    skip = pytest.mark.skip(reason="run with --benchmark-only")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 # This fixture enables loading custom integrations in all tests.
 # Remove to enable selective use of this fixture
 @pytest.fixture(autouse=True)
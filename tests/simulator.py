@@ -0,0 +1,225 @@
+"""Local websocket simulator of a Saleryd HRV control unit.
+
+Speaks the protocol of the unit as used by pysaleryd. Messages are `#KEY:VALUE\r`,
+error lists are sent as a frame of `*EA`, `*EB` per error and `*EZ`. Commands are
+acknowledged with `#$KEY:VALUE\r`, or `#!KEY:VALUE\r` when rejected.
+
+Recorded sessions (see `tests/fixtures/session.jsonl`) can be replayed to all
+connected clients at a configurable speed.
+
+Run standalone, e.g. for testing against a development instance:
+
+    python -m tests.simulator --port 3001 --speed 10 --loop
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterable, Iterator
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+from aiohttp import WSMsgType, web
+from pysaleryd.const import DataKeyEnum
+
+_LOGGER = logging.getLogger(__name__)
+
+SESSION_PATH = Path(__file__).parent / "fixtures" / "session.jsonl"
+
+# Keys that require the installer password to be sent before the command
+INSTALLER_KEYS = frozenset(
+    {
+        DataKeyEnum.CONTROL_SYSTEM_STATE,
+        DataKeyEnum.MODE_HEATER,
+        DataKeyEnum.TARGET_TEMPERATURE_NORMAL,
+        DataKeyEnum.TARGET_TEMPERATURE_ECONOMY,
+        DataKeyEnum.TARGET_TEMPERATURE_COOL,
+    }
+)
+
+
+def load_session(path: Path = SESSION_PATH) -> Iterator[tuple[float, dict[str, Any]]]:
+    """Load recorded frames as (seconds since start, changed keys) tuples.
+
+    Sessions are stored as JSON lines. Frame lines hold the keys that changed
+    since the previous frame, other lines, such as sent commands, are skipped.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if "frame" in record:
+                yield record["t"], record["frame"]
+
+
+def encode(key: str, value: Any, ack: str = "") -> Iterable[str]:
+    """Encode key and value as messages"""
+    if isinstance(value, list):
+        yield "#*EA:\r"
+        for error in value:
+            yield f"#*EB:{error}\r"
+        yield "#*EZ:\r"
+    else:
+        yield f"#{ack}{key}:{value}\r"
+
+
+class SalerydSimulator:
+    """Websocket server emulating a control unit"""
+
+    def __init__(
+        self,
+        state: dict[str, Any] | None = None,
+        installer_password: str | None = None,
+        auth_timeout: float | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.state: dict[str, Any] = dict(state or {})
+        self.installer_password = installer_password
+        self.auth_timeout = auth_timeout
+        self.commands: list[tuple[str, str]] = []
+        # connections accepted since start, including closed ones
+        self.accepted_count = 0
+        self._host = host
+        self._port = port
+        self._sockets: set[web.WebSocketResponse] = set()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def port(self) -> int:
+        """Port the simulator is listening on"""
+        return self._runner.addresses[0][1]
+
+    @property
+    def connection_count(self) -> int:
+        """Number of connected clients"""
+        return len(self._sockets)
+
+    async def start(self) -> None:
+        """Start listening"""
+        app = web.Application()
+        app.router.add_get("/", self._handle_websocket)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self._host, self._port).start()
+        _LOGGER.info("Simulator listening on %s:%s", self._host, self.port)
+
+    async def stop(self) -> None:
+        """Disconnect clients and stop listening"""
+        await self.drop_connections()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def drop_connections(self) -> None:
+        """Close all client connections, e.g. to test reconnects"""
+        for ws in list(self._sockets):
+            await ws.close()
+
+    async def update(self, frame: dict[str, Any]) -> None:
+        """Update state and send changed keys to all clients"""
+        self.state.update(frame)
+        messages = [
+            message for key, value in frame.items() for message in encode(key, value)
+        ]
+        await asyncio.gather(*(self._send(ws, messages) for ws in list(self._sockets)))
+
+    async def replay(self, path=SESSION_PATH, speed: float = 1.0) -> None:
+        """Replay a recorded session, speed is a multiplier of recorded time"""
+        start = time.monotonic()
+        for offset, frame in load_session(path):
+            delay = start + offset / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.update(frame)
+
+    async def _send(self, ws: web.WebSocketResponse, messages: Iterable[str]):
+        for message in messages:
+            if ws.closed:
+                return
+            await ws.send_str(message)
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        authenticated_at: float | None = None
+        try:
+            # the unit does not send anything until it has received a message
+            await ws.receive_str()
+            await ws.send_str("#\r")
+            self._sockets.add(ws)
+            self.accepted_count += 1
+            await self._send(
+                ws,
+                [
+                    message
+                    for key, value in self.state.items()
+                    for message in encode(key, value)
+                ],
+            )
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    key, value = msg.data.strip().lstrip("#").split(":", 1)
+                except ValueError:
+                    _LOGGER.warning("Unsupported message %s", msg.data)
+                    continue
+                self.commands.append((key, value))
+
+                if key == DataKeyEnum.INSTALLER_PASSWORD:
+                    if value == self.installer_password:
+                        authenticated_at = time.monotonic()
+                        await ws.send_str(f"#${key}:{value}\r")
+                    else:
+                        authenticated_at = None
+                        await ws.send_str(f"#!{key}:{value}\r")
+                    continue
+
+                if self.installer_password is not None and key in INSTALLER_KEYS:
+                    if authenticated_at is None or (
+                        self.auth_timeout is not None
+                        and time.monotonic() - authenticated_at > self.auth_timeout
+                    ):
+                        await self._send(ws, encode(key, self.state.get(key), "!"))
+                        continue
+
+                # keep min and max of the current value
+                _, *limits = str(self.state.get(key, "")).split("+")
+                self.state[key] = "+".join([value, *limits])
+                await self._send(ws, encode(key, self.state[key], "$"))
+        finally:
+            self._sockets.discard(ws)
+        return ws
+
+
+async def main() -> None:
+    """Run simulator from command line"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--session", default=SESSION_PATH, help="Session to replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed")
+    parser.add_argument("--loop", action="store_true", help="Replay session forever")
+    parser.add_argument("--installer-password", help="Require installer password")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    simulator = SalerydSimulator(
+        installer_password=args.installer_password, host=args.host, port=args.port
+    )
+    await simulator.start()
+    try:
+        while True:
+            await simulator.replay(args.session, args.speed)
+            if not args.loop:
+                await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Benchmarks of the bridge -> coordinator -> entity update path.
+
+Recorded frames are replayed through the bridge with all platforms loaded.
+Run benchmarks only with `pytest tests/test_benchmark.py --benchmark-only`.
+"""
+
+import statistics
+import time
+import tracemalloc
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+import pytest
+
+from .common import setup_integration
+from .simulator import load_session
+
+FRAMES = [frame for _, frame in load_session()]
+
+
+@pytest.fixture(name="client")
+async def client_fixture(hass):
+    """Set up integration and return its fake client."""
+    _, client = await setup_integration(hass)
+    return client
+
+
+@pytest.fixture(name="state_writes")
+def state_writes_fixture(hass):
+    """Count state changed events."""
+    state_writes = []
+
+    @callback
+    def _state_changed(event):
+        state_writes.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+    return state_writes
+
+
+@pytest.mark.benchmark(group="update_path")
+async def test_replay_throughput(hass, benchmark, client, state_writes):
+    """Benchmark frames/s, per frame latency and state writes per frame."""
+    latencies = []
+
+    def replay():
+        for frame in FRAMES:
+            start = time.perf_counter_ns()
+            client.push_frame(frame)
+            latencies.append(time.perf_counter_ns() - start)
+
+    benchmark(replay)
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    benchmark.extra_info.update(
+        {
+            "frames_per_second": len(latencies) / (sum(latencies) / 1e9),
+            "latency_p50_us": percentiles[49] / 1e3,
+            "latency_p95_us": percentiles[94] / 1e3,
+            "latency_p99_us": percentiles[98] / 1e3,
+            "state_writes_per_frame": len(state_writes) / len(latencies),
+        }
+    )
+    assert state_writes
+    # entities are not written more than once per changed frame
+    assert len(state_writes) < len(latencies) * len(hass.states.async_all())
+
+
+@pytest.mark.benchmark(group="update_path")
+async def test_replay_allocations(hass, benchmark, client):
+    """Benchmark memory allocated while replaying frames."""
+
+    def replay():
+        for frame in FRAMES:
+            client.push_frame(frame)
+
+    # warm up, so that allocations of the first update are not counted
+    replay()
+
+    tracemalloc.start()
+    try:
+        start_size, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+        benchmark.pedantic(replay, rounds=1, iterations=1)
+        after = tracemalloc.take_snapshot()
+        end_size, peak_size = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    allocated_blocks = sum(
+        max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno")
+    )
+    benchmark.extra_info.update(
+        {
+            "peak_traced_bytes": peak_size - start_size,
+            "retained_bytes_per_frame": (end_size - start_size) / len(FRAMES),
+            "retained_blocks_per_frame": allocated_blocks / len(FRAMES),
+        }
+    )
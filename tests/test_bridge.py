@@ -0,0 +1,371 @@
+"""Test saleryd_hrv bridge."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from homeassistant.util import dt as dt_util
+from pysaleryd.const import DataKeyEnum
+from pysaleryd.websocket import State
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.saleryd_hrv.bridge import SalerydLokeBridge
+from custom_components.saleryd_hrv.const import (
+    CONF_AUTH_TIMEOUT,
+    CONF_COALESCE_WINDOW,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_INSTALLER_PASSWORD,
+    KEY_CLIENT_STATE,
+    KEY_HEATER_ENERGY,
+    KEY_SUPPLY_TEMPERATURE_AVERAGE,
+    LOGGER,
+)
+from custom_components.saleryd_hrv.snapshot import SalerydLokeProperty
+
+from .common import FakeClient
+
+FRAME = {
+    DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM: "120",
+    DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21",
+    DataKeyEnum.MODE_FAN: "0+0+2",
+}
+
+
+def create_bridge(options=None, coordinator=None, client=None):
+    """Create bridge with mocked entry, client and coordinator."""
+    entry = MagicMock()
+    entry.options = options or {}
+    entry.data = {CONF_INSTALLER_PASSWORD: "1234"}
+    if client is None:
+        client = MagicMock()
+        client.state = State.RUNNING
+    return SalerydLokeBridge(entry, client, coordinator or MagicMock(), LOGGER)
+
+
+@pytest.fixture(name="bridge")
+def bridge_fixture():
+    """Create bridge."""
+    return create_bridge()
+
+
+def test_first_frame_updates_all_keys(bridge):
+    """Test that all keys are reported as changed on first frame."""
+    bridge.update_data_callback(FRAME)
+
+    data, changed_keys = bridge.coordinator.async_set_changed_data.call_args.args
+    assert changed_keys >= FRAME.keys()
+    assert KEY_CLIENT_STATE in changed_keys
+    assert data[DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM] == "120"
+
+
+def test_unchanged_frame_is_skipped(bridge):
+    """Test that a frame identical to the previous one does not update."""
+    bridge.update_data_callback(FRAME)
+    bridge.update_data_callback(FRAME.copy())
+
+    assert bridge.coordinator.async_set_changed_data.call_count == 1
+
+
+def test_only_changed_keys_are_reported(bridge):
+    """Test that only keys that changed, or were removed, are reported."""
+    bridge.update_data_callback(FRAME)
+    frame = FRAME | {DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM: "130"}
+    del frame[DataKeyEnum.MODE_FAN]
+    bridge.update_data_callback(frame)
+
+    _, changed_keys = bridge.coordinator.async_set_changed_data.call_args.args
+    assert changed_keys == {DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM, DataKeyEnum.MODE_FAN}
+
+
+def test_frames_are_measured(bridge):
+    """Test that frames, updated keys and dispatch time are recorded."""
+    bridge.update_data_callback(FRAME)
+    bridge.update_data_callback(FRAME | {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "22"})
+
+    metrics = bridge.metrics
+    assert metrics.frames.total == 2
+    assert metrics.dispatch_time.count == 2
+    assert metrics.last_frame_age >= 0
+    rates = metrics.key_update_rates()
+    assert rates[DataKeyEnum.AIR_TEMPERATURE_SUPPLY] == 2 * rates[DataKeyEnum.MODE_FAN]
+    # virtual keys are not received from the unit
+    assert KEY_CLIENT_STATE not in rates
+    # messages are "#KEY:VALUE\r", only the changed value is sent again
+    message_sizes = {key: len(key) + len(value) + 3 for key, value in FRAME.items()}
+    assert metrics.bytes_received.total == (
+        sum(message_sizes.values()) + message_sizes[DataKeyEnum.AIR_TEMPERATURE_SUPPLY]
+    )
+
+
+def test_heater_energy(bridge):
+    """Test that heater power is integrated into energy between frames."""
+    frame = FRAME | {
+        DataKeyEnum.HEATER_POWER_PERCENT: "50",
+        DataKeyEnum.MODE_HEATER_POWER_RATING: "1+0+1",
+    }
+    bridge.restore_totals({KEY_HEATER_ENERGY: 1})
+    with patch("custom_components.saleryd_hrv.bridge.time.monotonic") as monotonic:
+        monotonic.return_value = 0
+        bridge.update_data_callback(frame)
+        monotonic.return_value = 60
+        bridge.update_data_callback(frame | {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "22"})
+
+    data, changed_keys = bridge.coordinator.async_set_changed_data.call_args.args
+    assert KEY_HEATER_ENERGY in changed_keys
+    assert data[KEY_HEATER_ENERGY] == pytest.approx(1.015)
+
+
+def test_heater_energy_of_unchanged_frames(bridge):
+    """Test that unchanged frames are integrated, but not while disconnected."""
+    frame = FRAME | {
+        DataKeyEnum.HEATER_POWER_PERCENT: "50",
+        DataKeyEnum.MODE_HEATER_POWER_RATING: "1+0+1",
+    }
+    with patch("custom_components.saleryd_hrv.bridge.time.monotonic") as monotonic:
+        monotonic.return_value = 0
+        bridge.update_data_callback(frame)
+        # the client calls handlers with its last data while connected
+        for seconds in (30, 60, 90, 120, 150, 180):
+            monotonic.return_value = seconds
+            bridge.update_data_callback(frame)
+        snapshot, changed_keys = (
+            bridge.coordinator.async_set_changed_data.call_args.args
+        )
+        assert KEY_HEATER_ENERGY in changed_keys
+        assert changed_keys.isdisjoint(frame)
+        assert snapshot[KEY_HEATER_ENERGY] == pytest.approx(0.045)
+
+        bridge.client.state = State.RETRYING
+        monotonic.return_value = 200
+        bridge.update_data_callback(frame)
+        bridge.client.state = State.RUNNING
+        monotonic.return_value = 220
+        bridge.update_data_callback(frame)
+        snapshot, _ = bridge.coordinator.async_set_changed_data.call_args.args
+        assert snapshot[KEY_HEATER_ENERGY] == pytest.approx(0.045)
+
+
+def test_average_of_unchanged_frames(bridge):
+    """Test that moving averages advance with unchanged frames while connected."""
+    with patch("custom_components.saleryd_hrv.bridge.time.monotonic") as monotonic:
+        monotonic.return_value = 0
+        bridge.update_data_callback(FRAME)
+        monotonic.return_value = 1
+        bridge.update_data_callback(FRAME | {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "25"})
+        snapshot, _ = bridge.coordinator.async_set_changed_data.call_args.args
+        assert snapshot[KEY_SUPPLY_TEMPERATURE_AVERAGE] == 21
+
+        bridge.coordinator.reset_mock()
+        for seconds in range(30, 3600, 30):
+            monotonic.return_value = seconds
+            bridge.update_data_callback(
+                FRAME | {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "25"}
+            )
+        snapshot, changed_keys = (
+            bridge.coordinator.async_set_changed_data.call_args.args
+        )
+        assert changed_keys == {KEY_SUPPLY_TEMPERATURE_AVERAGE}
+        assert snapshot[KEY_SUPPLY_TEMPERATURE_AVERAGE] == pytest.approx(24.9)
+
+
+def test_frame_is_parsed_into_snapshot(bridge):
+    """Test that values are parsed into the snapshot."""
+    bridge.update_data_callback(FRAME)
+
+    snapshot, _ = bridge.coordinator.async_set_changed_data.call_args.args
+    assert snapshot.get_property(DataKeyEnum.MODE_FAN) == SalerydLokeProperty(0, 0, 2)
+    assert snapshot.get_property(DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM).value == 120
+    assert snapshot.get_property(DataKeyEnum.FILTER_MONTHS_LEFT).value is None
+
+
+async def test_frames_are_coalesced(hass):
+    """Test that a burst of frames is merged into one update."""
+    coordinator = MagicMock()
+    coordinator.hass = hass
+    bridge = create_bridge({CONF_COALESCE_WINDOW: 200}, coordinator)
+
+    # first frame after idle period is not delayed
+    bridge.update_data_callback(FRAME)
+    assert coordinator.async_set_changed_data.call_count == 1
+
+    bridge.update_data_callback(FRAME | {DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM: "130"})
+    bridge.update_data_callback(FRAME | {DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM: "140"})
+    assert coordinator.async_set_changed_data.call_count == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert coordinator.async_set_changed_data.call_count == 2
+    snapshot, changed_keys = coordinator.async_set_changed_data.call_args.args
+    assert changed_keys == {DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM}
+    assert snapshot[DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM] == "140"
+
+
+async def test_concurrent_commands_are_batched(hass):
+    """Test that concurrent commands are merged by key and sent in one batch."""
+    coordinator = MagicMock()
+    coordinator.hass = hass
+    client = FakeClient("127.0.0.1", 3001, None)
+    bridge = create_bridge(coordinator=coordinator, client=client)
+
+    await asyncio.gather(
+        bridge.send_command(DataKeyEnum.TARGET_TEMPERATURE_NORMAL, 20),
+        bridge.send_command(DataKeyEnum.TARGET_TEMPERATURE_ECONOMY, 18, auth=True),
+        bridge.send_command(DataKeyEnum.TARGET_TEMPERATURE_NORMAL, 21),
+    )
+
+    assert client.commands == [
+        (DataKeyEnum.INSTALLER_PASSWORD, "1234"),
+        (DataKeyEnum.TARGET_TEMPERATURE_NORMAL, 21),
+        (DataKeyEnum.TARGET_TEMPERATURE_ECONOMY, 18),
+    ]
+
+    await bridge.send_command(DataKeyEnum.MODE_FAN, 1)
+    assert client.commands[-1] == (DataKeyEnum.MODE_FAN, 1)
+
+
+async def test_installer_password_is_sent_first(hass):
+    """Test that installer commands are not sent before the password completed."""
+    coordinator = MagicMock()
+    coordinator.hass = hass
+    client = FakeClient("127.0.0.1", 3001, None)
+    bridge = create_bridge(coordinator=coordinator, client=client)
+    password_received = asyncio.Event()
+    password_sent = asyncio.Event()
+    send_command = client.send_command
+
+    async def send_password_slowly(key, value):
+        await send_command(key, value)
+        if key == DataKeyEnum.INSTALLER_PASSWORD:
+            password_received.set()
+            await password_sent.wait()
+
+    client.send_command = send_password_slowly
+    task = hass.async_create_task(
+        bridge.send_command(DataKeyEnum.MODE_HEATER, 1, auth=True)
+    )
+    await password_received.wait()
+    await asyncio.sleep(0)
+    assert client.commands == [(DataKeyEnum.INSTALLER_PASSWORD, "1234")]
+
+    password_sent.set()
+    await task
+    assert client.commands[-1] == (DataKeyEnum.MODE_HEATER, 1)
+
+
+async def test_installer_session_is_reused(hass):
+    """Test that the installer password is only sent when session is not valid."""
+    coordinator = MagicMock()
+    coordinator.hass = hass
+    client = FakeClient("127.0.0.1", 3001, None)
+    await client.connect()
+    bridge = create_bridge({CONF_AUTH_TIMEOUT: 60}, coordinator, client)
+
+    await bridge.send_command(DataKeyEnum.MODE_HEATER, 1, auth=True)
+    await bridge.send_command(DataKeyEnum.MODE_HEATER, 0, auth=True)
+    assert client.commands == [
+        (DataKeyEnum.INSTALLER_PASSWORD, "1234"),
+        (DataKeyEnum.MODE_HEATER, 1),
+        (DataKeyEnum.MODE_HEATER, 0),
+    ]
+
+    # reconnecting requires a new session
+    client.state = State.RETRYING
+    bridge.update_data_callback(FRAME)
+    client.state = State.RUNNING
+    client.commands.clear()
+    await bridge.send_command(DataKeyEnum.MODE_HEATER, 1, auth=True)
+    assert client.commands[0] == (DataKeyEnum.INSTALLER_PASSWORD, "1234")
+
+
+async def test_commands_are_confirmed(hass):
+    """Test that commands wait for the new value to be received."""
+    coordinator = MagicMock()
+    coordinator.hass = hass
+    client = FakeClient("127.0.0.1", 3001, None)
+    bridge = create_bridge({CONF_CONFIRM_TIMEOUT: 1}, coordinator, client)
+
+    task = hass.async_create_task(bridge.send_command(DataKeyEnum.MODE_FAN, 1))
+    await asyncio.sleep(0)
+    client.push_frame(FRAME)
+    assert not task.done()
+
+    client.push_frame({DataKeyEnum.MODE_FAN: "1+0+2"})
+    assert await task
+    assert bridge.metrics.commands_confirmed == 1
+    assert bridge.metrics.command_latency.count == 1
+
+    # never confirmed
+    assert not await bridge.send_command(DataKeyEnum.MODE_FAN, 2)
+    assert bridge.metrics.commands_timed_out == 1
+
+
+def test_client_data_is_not_copied(bridge):
+    """Test that frames are read in place and snapshots share unchanged entries."""
+    frame = FRAME | {
+        DataKeyEnum.FILTER_MONTHS_LEFT: "4",
+        DataKeyEnum.TARGET_TEMPERATURE_NORMAL: "21+10+30",
+        DataKeyEnum.TARGET_TEMPERATURE_ECONOMY: "17+10+30",
+        DataKeyEnum.AIR_TEMPERATURE_AT_HEATER: "22",
+    }
+    bridge.update_data_callback(frame)
+    first, _ = bridge.coordinator.async_set_changed_data.call_args.args
+
+    frame[DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM] = "130"
+    bridge.update_data_callback(frame)
+    second, changed_keys = bridge.coordinator.async_set_changed_data.call_args.args
+
+    assert changed_keys == {DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM}
+    assert first[DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM] == "120"
+    assert second[DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM] == "130"
+    assert second.get_property(DataKeyEnum.MODE_FAN) is first.get_property(
+        DataKeyEnum.MODE_FAN
+    )
+    assert len(second) == len(first)
+    assert not hasattr(second, "__dict__")
+    assert not hasattr(second.get_property(DataKeyEnum.MODE_FAN), "__dict__")
+
+
+async def test_superseded_command_is_not_confirmed(hass):
+    """Test that a command is not confirmed once a newer command for the key is sent."""
+    coordinator = MagicMock()
+    coordinator.hass = hass
+    client = FakeClient("127.0.0.1", 3001, None)
+    bridge = create_bridge({CONF_CONFIRM_TIMEOUT: 1}, coordinator, client)
+
+    first = hass.async_create_task(bridge.send_command(DataKeyEnum.MODE_FAN, 1))
+    await asyncio.sleep(0)
+    second = hass.async_create_task(bridge.send_command(DataKeyEnum.MODE_FAN, 2))
+    await asyncio.sleep(0)
+
+    client.push_frame({DataKeyEnum.MODE_FAN: "2+0+2"})
+    assert not await first
+    assert await second
+    assert bridge.metrics.commands_confirmed == 1
+
+
+async def test_unconfirmed_installer_command_ends_session(hass):
+    """Test that the installer session is not reused after a command timed out."""
+    coordinator = MagicMock()
+    coordinator.hass = hass
+    client = FakeClient("127.0.0.1", 3001, None)
+    await client.connect()
+    bridge = create_bridge(
+        {CONF_CONFIRM_TIMEOUT: 0.01, CONF_AUTH_TIMEOUT: 60}, coordinator, client
+    )
+
+    assert not await bridge.send_command(DataKeyEnum.MODE_HEATER, 1, auth=True)
+    assert bridge.metrics.commands_timed_out == 1
+
+    client.commands.clear()
+    task = hass.async_create_task(
+        bridge.send_command(DataKeyEnum.MODE_HEATER, 1, auth=True)
+    )
+    await asyncio.sleep(0)
+    client.push_frame({DataKeyEnum.MODE_HEATER: "1"})
+    assert await task
+    assert client.commands == [
+        (DataKeyEnum.INSTALLER_PASSWORD, "1234"),
+        (DataKeyEnum.MODE_HEATER, 1),
+    ]
@@ -0,0 +1,51 @@
+"""Test saleryd_hrv capture."""
+
+import json
+
+from pysaleryd.const import DataKeyEnum
+
+from custom_components.saleryd_hrv.capture import SalerydLokeCapture
+
+from .simulator import load_session
+
+
+async def test_capture_is_replayable(hass, tmp_path):
+    """Test that captured frames and commands are written as a session."""
+    path = tmp_path / "capture.jsonl"
+    capture = SalerydLokeCapture(hass, str(path))
+    await capture.async_start()
+
+    data = {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21", DataKeyEnum.MODE_FAN: "0+0+2"}
+    capture.record_frame(data)
+    data[DataKeyEnum.AIR_TEMPERATURE_SUPPLY] = "22"
+    capture.record_frame(data)
+    capture.record_command(DataKeyEnum.INSTALLER_PASSWORD, "1234")
+    capture.record_command(DataKeyEnum.MODE_FAN, 1)
+    await hass.async_block_till_done()
+    await capture.async_stop()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert "start" in records[0]
+    assert [record.get("command") for record in records[3:]] == [
+        [DataKeyEnum.INSTALLER_PASSWORD, "***"],
+        [DataKeyEnum.MODE_FAN, 1],
+    ]
+    assert [frame for _, frame in load_session(path)] == [
+        {"*TC": "21", "MF": "0+0+2"},
+        {"*TC": "22"},
+    ]
+
+
+async def test_capture_drops_records_when_full(hass, tmp_path):
+    """Test that records are dropped rather than blocking when buffer is full."""
+    path = tmp_path / "capture.jsonl"
+    capture = SalerydLokeCapture(hass, str(path), maxsize=2)
+    await capture.async_start()
+
+    for value in range(3):
+        capture.record_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: str(value)})
+    await capture.async_stop()
+
+    assert capture.dropped == 1
+    # start record and the frames that fit in the buffer
+    assert len(path.read_text().splitlines()) == 3
@@ -0,0 +1,80 @@
+"""Test saleryd_hrv coordinator."""
+
+from unittest.mock import MagicMock
+
+from pysaleryd.const import DataKeyEnum
+
+from custom_components.saleryd_hrv.const import LOGGER
+from custom_components.saleryd_hrv.coordinator import SalerydLokeDataUpdateCoordinator
+
+
+async def test_key_listeners(hass):
+    """Test that key listeners are only called when their keys change."""
+    coordinator = SalerydLokeDataUpdateCoordinator(hass, LOGGER)
+    rpm_listener = MagicMock()
+    heater_listener = MagicMock()
+    coordinator.async_add_key_listener(
+        DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM, rpm_listener
+    )
+    coordinator.async_add_key_listener(
+        DataKeyEnum.HEATER_POWER_PERCENT, heater_listener
+    )
+    remove_listener = coordinator.async_add_key_listener(
+        DataKeyEnum.MODE_HEATER_POWER_RATING, heater_listener
+    )
+
+    coordinator.async_set_changed_data(
+        {}, frozenset({DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM})
+    )
+    assert rpm_listener.call_count == 1
+    assert heater_listener.call_count == 0
+
+    # listener of several changed keys is only called once
+    coordinator.async_set_changed_data(
+        {},
+        frozenset(
+            {DataKeyEnum.HEATER_POWER_PERCENT, DataKeyEnum.MODE_HEATER_POWER_RATING}
+        ),
+    )
+    assert rpm_listener.call_count == 1
+    assert heater_listener.call_count == 1
+
+    remove_listener()
+    coordinator.async_set_changed_data(
+        {}, frozenset({DataKeyEnum.MODE_HEATER_POWER_RATING})
+    )
+    assert heater_listener.call_count == 1
+
+    # all listeners are updated on errors
+    coordinator.async_set_update_error(Exception())
+    assert rpm_listener.call_count == 2
+    assert heater_listener.call_count == 2
+
+
+async def test_entity_listeners(hass):
+    """Test that listeners with data keys as context are key listeners."""
+    coordinator = SalerydLokeDataUpdateCoordinator(hass, LOGGER)
+    entity_listener = MagicMock()
+    listener = MagicMock()
+    remove_entity_listener = coordinator.async_add_listener(
+        entity_listener,
+        (DataKeyEnum.HEATER_POWER_PERCENT, DataKeyEnum.MODE_HEATER_POWER_RATING),
+    )
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_set_changed_data(
+        {}, frozenset({DataKeyEnum.HEAT_EXCHANGER_ROTOR_RPM})
+    )
+    assert entity_listener.call_count == 0
+    assert listener.call_count == 1
+
+    coordinator.async_set_changed_data(
+        {}, frozenset({DataKeyEnum.MODE_HEATER_POWER_RATING})
+    )
+    assert entity_listener.call_count == 1
+
+    remove_entity_listener()
+    coordinator.async_set_changed_data(
+        {}, frozenset({DataKeyEnum.MODE_HEATER_POWER_RATING})
+    )
+    assert entity_listener.call_count == 1
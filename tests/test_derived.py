@@ -0,0 +1,112 @@
+"""Test saleryd_hrv derived values."""
+
+import math
+
+from pysaleryd.const import DataKeyEnum
+import pytest
+
+from custom_components.saleryd_hrv.const import (
+    KEY_BOOST_MODE_MINUTES,
+    KEY_EXTRACT_FAN_HOURS,
+    KEY_FIREPLACE_MODE_MINUTES,
+    KEY_HEATER_ENERGY,
+    KEY_HEATER_RUNTIME,
+    KEY_HEATER_TEMPERATURE_RISE,
+    KEY_SUPPLY_FAN_HOURS,
+    KEY_SUPPLY_TEMPERATURE_AVERAGE,
+    HeaterModeEnum,
+)
+from custom_components.saleryd_hrv.derived import (
+    SalerydLokeDerivedData,
+    SalerydLokeMovingAverage,
+    SalerydLokeTotals,
+    get_heater_power,
+)
+from custom_components.saleryd_hrv.snapshot import SalerydLokeSnapshot
+
+
+@pytest.mark.parametrize(
+    ("heater_power_percent", "heater_mode", "expected"),
+    [
+        (50, HeaterModeEnum.Low, 450),
+        (50, HeaterModeEnum.High, 900),
+        (None, HeaterModeEnum.High, None),
+        (50, None, None),
+    ],
+)
+def test_heater_power(heater_power_percent, heater_mode, expected):
+    """Test heater power is estimated from percent of the power rating."""
+    assert get_heater_power(heater_power_percent, heater_mode) == expected
+
+
+def test_totals():
+    """Test rates are accumulated while held, except over long gaps."""
+    frame = {
+        DataKeyEnum.FAN_SPEED_SUPPLY: "50",
+        DataKeyEnum.FAN_SPEED_EXHAUST: "25",
+        DataKeyEnum.HEATER_POWER_PERCENT: "50",
+        DataKeyEnum.MODE_HEATER_POWER_RATING: "1+0+1",
+        DataKeyEnum.MODE_FAN: "2+0+2",
+        DataKeyEnum.FIREPLACE_MODE: "0+0+1",
+    }
+    snapshot = SalerydLokeSnapshot().evolve(frame, frame.keys())
+    totals = SalerydLokeTotals()
+    totals.restore({KEY_HEATER_ENERGY: 1, "unknown": 1})
+    assert totals.data[KEY_HEATER_ENERGY] == 1
+    totals.update(snapshot, 0)
+    totals.update(snapshot, 120)
+    assert totals.data == {
+        KEY_HEATER_ENERGY: pytest.approx(1.03),
+        KEY_HEATER_RUNTIME: pytest.approx(0.03),
+        KEY_SUPPLY_FAN_HOURS: pytest.approx(0.02),
+        KEY_EXTRACT_FAN_HOURS: pytest.approx(0.01),
+        KEY_BOOST_MODE_MINUTES: 2,
+        KEY_FIREPLACE_MODE_MINUTES: 0,
+    }
+    # disconnected
+    totals.update(snapshot, 1000)
+    totals.interrupt()
+    totals.update(snapshot, 1060)
+    assert totals.data[KEY_BOOST_MODE_MINUTES] == 2
+
+
+def test_moving_average():
+    """Test values are weighted by the time they were held."""
+    average = SalerydLokeMovingAverage(time_constant=900)
+    assert average.update(None, 0) is None
+    assert average.update(21, 0) == 21
+    assert average.update(25, 30) == 21
+    assert average.update(25, 930) == pytest.approx(25 - 4 / math.e)
+    # disconnected
+    average.interrupt()
+    assert average.update(21, 5000) == pytest.approx(25 - 4 / math.e)
+
+
+def test_derived_data():
+    """Test derived values are only computed when their input keys changed."""
+    frame = {
+        DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21",
+        DataKeyEnum.AIR_TEMPERATURE_AT_HEATER: "18",
+    }
+    snapshot = SalerydLokeSnapshot().evolve(frame, frame.keys())
+    derived = SalerydLokeDerivedData()
+    assert derived.update(snapshot, frozenset(frame), 0) >= {
+        KEY_HEATER_TEMPERATURE_RISE,
+        KEY_SUPPLY_TEMPERATURE_AVERAGE,
+    }
+    assert derived.data[KEY_HEATER_TEMPERATURE_RISE] == 3
+    assert derived.update(snapshot, frozenset(), 30) == set()
+
+    snapshot = snapshot.evolve(
+        {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "22"}, {DataKeyEnum.AIR_TEMPERATURE_SUPPLY}
+    )
+    assert KEY_HEATER_TEMPERATURE_RISE not in derived.update(
+        snapshot, frozenset({DataKeyEnum.FAN_SPEED_SUPPLY}), 60
+    )
+    assert derived.update(
+        snapshot, frozenset({DataKeyEnum.AIR_TEMPERATURE_SUPPLY}), 90
+    ) == {KEY_HEATER_TEMPERATURE_RISE}
+    assert derived.data[KEY_HEATER_TEMPERATURE_RISE] == 4
+
+    # averages are not updated while disconnected
+    assert derived.update(snapshot, frozenset(), None) == set()
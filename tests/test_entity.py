@@ -0,0 +1,162 @@
+"""Test saleryd_hrv entity."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.select import ATTR_OPTION, SERVICE_SELECT_OPTION
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    EVENT_STATE_CHANGED,
+    STATE_OFF,
+    STATE_ON,
+    Platform,
+)
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import dt as dt_util
+from pysaleryd.const import DataKeyEnum
+from pysaleryd.utils import ErrorSystemProperty
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.saleryd_hrv.const import CONF_CONFIRM_TIMEOUT
+
+from .common import setup_integration
+from .simulator import load_session
+
+_, INITIAL_STATE = next(load_session())
+
+
+def track_state_writes(hass, entity_id):
+    """Return list of state changed events of entity."""
+    state_writes = []
+
+    @callback
+    def _state_changed(event):
+        if event.data["entity_id"] == entity_id:
+            state_writes.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+    return state_writes
+
+
+async def test_entities_share_device(hass):
+    """Test that all entities of an entry are added to the same device."""
+    entry, client = await setup_integration(hass)
+    client.push_frame(INITIAL_STATE)
+    await hass.async_block_till_done()
+
+    entities = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    devices = dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)
+    assert entities
+    assert len(devices) == 1
+    assert {entity.device_id for entity in entities} == {devices[0].id}
+
+
+async def test_unchanged_state_is_not_written(hass):
+    """Test that the state is only written when the rendered state changed."""
+    entry, client = await setup_integration(hass)
+    client.push_frame(INITIAL_STATE)
+    await hass.async_block_till_done()
+    entity_id = f"sensor.{entry.unique_id}_target_temperature"
+    assert hass.states.get(entity_id).state == "21"
+    state_writes = track_state_writes(hass, entity_id)
+
+    # target temperature of another mode is a data key, but not rendered
+    client.push_frame({DataKeyEnum.TARGET_TEMPERATURE_ECONOMY: "17+10+30"})
+    await hass.async_block_till_done()
+    assert state_writes == []
+
+    client.push_frame({DataKeyEnum.TARGET_TEMPERATURE_NORMAL: "22+10+30"})
+    await hass.async_block_till_done()
+    assert len(state_writes) == 1
+    assert hass.states.get(entity_id).state == "22"
+
+
+async def test_errors_are_decoded_once(hass):
+    """Test that errors are only decoded when the raw value changed."""
+    entry, client = await setup_integration(hass)
+    entity_id = f"binary_sensor.{entry.unique_id}_system_warning"
+    with patch(
+        "custom_components.saleryd_hrv.binary_sensor.ErrorSystemProperty",
+        wraps=ErrorSystemProperty,
+    ) as decode:
+        client.push_frame(INITIAL_STATE | {DataKeyEnum.ERROR_MESSAGE: ["F1"]})
+        await hass.async_block_till_done()
+        state = hass.states.get(entity_id)
+        assert state.state == STATE_ON
+        assert state.attributes["F1"] is True
+        assert decode.call_count == 1
+
+        # unchanged errors and updates of other keys are not decoded again
+        client.push_frame({DataKeyEnum.ERROR_MESSAGE: ["F1"]})
+        client.push_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "25"})
+        await hass.async_block_till_done()
+        assert decode.call_count == 1
+
+        client.push_frame({DataKeyEnum.ERROR_MESSAGE: []})
+        await hass.async_block_till_done()
+        assert hass.states.get(entity_id).state == STATE_OFF
+        assert decode.call_count == 2
+
+
+async def test_optimistic_state(hass):
+    """Test that commands are shown right away and rolled back unless received."""
+    entry, client = await setup_integration(hass)
+    client.push_frame(INITIAL_STATE)
+    entity_id = f"select.{entry.unique_id}_ventilation_mode"
+    assert hass.states.get(entity_id).state == "Normal"
+
+    async def select_option(option):
+        await hass.services.async_call(
+            Platform.SELECT,
+            SERVICE_SELECT_OPTION,
+            {ATTR_ENTITY_ID: entity_id, ATTR_OPTION: option},
+            blocking=True,
+        )
+
+    # not received in time
+    await select_option("Away")
+    assert client.commands == [(DataKeyEnum.MODE_FAN, 1)]
+    assert hass.states.get(entity_id).state == "Away"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "Normal"
+
+    # received, frames without the new value do not roll back
+    await select_option("Boost")
+    client.push_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "20"})
+    assert hass.states.get(entity_id).state == "Boost"
+    client.push_frame({DataKeyEnum.MODE_FAN: "2+0+2"})
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=22))
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "Boost"
+
+
+async def test_optimistic_state_waits_for_confirmation(hass):
+    """Test that optimistic state is kept while the command awaits confirmation."""
+    entry, client = await setup_integration(hass, {CONF_CONFIRM_TIMEOUT: 30})
+    client.push_frame(INITIAL_STATE)
+    entity_id = f"select.{entry.unique_id}_ventilation_mode"
+
+    task = hass.async_create_task(
+        hass.services.async_call(
+            Platform.SELECT,
+            SERVICE_SELECT_OPTION,
+            {ATTR_ENTITY_ID: entity_id, ATTR_OPTION: "Away"},
+            blocking=True,
+        )
+    )
+    while not client.commands:
+        await asyncio.sleep(0)
+    assert hass.states.get(entity_id).state == "Away"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await asyncio.sleep(0)
+    assert hass.states.get(entity_id).state == "Away"
+
+    client.push_frame({DataKeyEnum.MODE_FAN: "1+0+2"})
+    await task
+    assert hass.states.get(entity_id).state == "Away"
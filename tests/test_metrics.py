@@ -0,0 +1,38 @@
+"""Test saleryd_hrv metrics."""
+
+import pytest
+
+from custom_components.saleryd_hrv.metrics import SalerydLokeHistogram, SalerydLokeRate
+
+
+def test_histogram():
+    """Test values are counted in buckets and percentiles estimated."""
+    histogram = SalerydLokeHistogram((0.1, 1, 10))
+    assert histogram.percentile(50) is None
+
+    for value in (0.05, 0.2, 0.3, 0.5, 20):
+        histogram.record(value)
+
+    assert histogram.counts == [1, 3, 0, 1]
+    assert histogram.mean == pytest.approx(4.21)
+    assert histogram.percentile(50) == 1
+    assert histogram.percentile(100) == 20
+    assert histogram.as_dict()["buckets"] == {
+        "le_0.1": 1,
+        "le_1": 3,
+        "le_10": 0,
+        "le_inf": 1,
+    }
+
+
+def test_rate():
+    """Test rate over a sliding window of fixed slots."""
+    rate = SalerydLokeRate(window=60, slots=6)
+    for second in range(0, 60, 5):
+        rate.record(1, 1000 + second)
+
+    assert rate.rate(1059) == pytest.approx(0.2)
+    # oldest slot has fallen out of the window
+    assert rate.rate(1065) == pytest.approx(10 / 60)
+    assert rate.rate(1200) == 0
+    assert rate.total == 12
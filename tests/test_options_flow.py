@@ -0,0 +1,94 @@
+"""Test saleryd_hrv options flow."""
+
+from unittest.mock import patch
+
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+
+from custom_components.saleryd_hrv.const import (
+    CONF_CAPTURE,
+    CONF_COALESCE_WINDOW,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_SENSOR,
+    CONF_SENSOR_FILTERS,
+)
+
+from .common import FakeClient, setup_integration
+
+
+@pytest.fixture(autouse=True)
+def fake_client():
+    """Use a fake client when the entry is reloaded with new options."""
+    with patch("custom_components.saleryd_hrv.Client", FakeClient):
+        yield
+
+
+async def test_options_menu(hass):
+    """Test that options start with a menu of settings and sensor filters."""
+    entry, _ = await setup_integration(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.MENU
+    assert result["menu_options"] == ["settings", "sensor"]
+
+
+async def test_options_settings(hass):
+    """Test that settings are saved, keeping other options."""
+    sensor_filters = {"supply_fan_speed": {CONF_DEADBAND_ABSOLUTE: 1}}
+    entry, _ = await setup_integration(
+        hass, options={CONF_SENSOR_FILTERS: sensor_filters}
+    )
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "settings"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "settings"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_COALESCE_WINDOW: 200}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_COALESCE_WINDOW] == 200
+    assert entry.options[CONF_CAPTURE] is False
+    assert entry.options[CONF_SENSOR_FILTERS] == sensor_filters
+
+
+async def test_options_sensor_filter(hass):
+    """Test that a filter is saved for the selected sensor."""
+    sensor_filters = {"supply_fan_speed": {CONF_DEADBAND_ABSOLUTE: 1}}
+    entry, _ = await setup_integration(
+        hass, options={CONF_COALESCE_WINDOW: 200, CONF_SENSOR_FILTERS: sensor_filters}
+    )
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "sensor"}
+    )
+    assert result["step_id"] == "sensor"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_SENSOR: "supply_air_temperature"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "sensor_filter"
+    assert result["description_placeholders"] == {"sensor": "Supply air temperature"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_DEADBAND_ABSOLUTE: 0.5, CONF_MIN_PUBLISH_INTERVAL: 60}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_COALESCE_WINDOW] == 200
+    assert entry.options[CONF_SENSOR_FILTERS] == {
+        **sensor_filters,
+        "supply_air_temperature": {
+            CONF_DEADBAND_ABSOLUTE: 0.5,
+            CONF_DEADBAND_PERCENT: 0,
+            CONF_MIN_PUBLISH_INTERVAL: 60,
+        },
+    }
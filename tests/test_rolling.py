@@ -0,0 +1,61 @@
+"""Test saleryd_hrv rolling window statistics."""
+
+from pysaleryd.const import DataKeyEnum
+import pytest
+
+from custom_components.saleryd_hrv.rolling import (
+    SalerydLokeRollingStatistics,
+    SalerydLokeRollingWindow,
+)
+from custom_components.saleryd_hrv.snapshot import SalerydLokeSnapshot
+
+
+def test_rolling_window():
+    """Test statistics of values within the window."""
+    window = SalerydLokeRollingWindow(60, slots=12)
+    assert window.get_statistics(1000) is None
+
+    for second, value in ((0, 1), (20, 2), (40, 3), (60, 4)):
+        window.record(value, 1000 + second)
+
+    # first value has fallen out of the window
+    statistics = window.get_statistics(1060)
+    assert statistics["count"] == 3
+    assert statistics["mean"] == 3
+    assert statistics["min"] == 2
+    assert statistics["max"] == 4
+    assert statistics["stddev"] == pytest.approx((2 / 3) ** 0.5)
+    # slots are reused
+    assert window.get_statistics(1110)["count"] == 1
+    assert window.get_statistics(2000) is None
+
+
+def test_rolling_statistics():
+    """Test numeric values of snapshots are sampled while held, in every window."""
+    rolling = SalerydLokeRollingStatistics(
+        keys=(DataKeyEnum.AIR_TEMPERATURE_SUPPLY, DataKeyEnum.FAN_SPEED_SUPPLY),
+        windows={"short": 60, "long": 3600},
+        sample_interval=5,
+    )
+    frame = {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21"}
+    snapshot = SalerydLokeSnapshot().evolve(frame, frame.keys())
+    rolling.update(snapshot, 0)
+    # samples do not depend on how often the snapshot is updated
+    for second in (1, 2, 3, 30):
+        rolling.update(snapshot, second)
+
+    for window in ("short", "long"):
+        statistics = rolling.get_statistics(
+            DataKeyEnum.AIR_TEMPERATURE_SUPPLY, window, 30
+        )
+        assert statistics["mean"] == 21
+        assert statistics["count"] == 6
+    assert rolling.get_statistics(DataKeyEnum.FAN_SPEED_SUPPLY, "long", 30) is None
+
+    # disconnected
+    rolling.interrupt()
+    rolling.update(snapshot, 1000)
+    statistics = rolling.get_statistics(
+        DataKeyEnum.AIR_TEMPERATURE_SUPPLY, "long", 1000
+    )
+    assert statistics["count"] == 6
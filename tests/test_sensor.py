@@ -0,0 +1,49 @@
+"""Test saleryd_hrv sensor."""
+
+from custom_components.saleryd_hrv.const import (
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_MIN_PUBLISH_INTERVAL,
+)
+from custom_components.saleryd_hrv.sensor import SalerydLokePublishFilter
+
+
+def test_publish_filter_first_value():
+    """Test that the first value is always published."""
+    publish_filter = SalerydLokePublishFilter(
+        deadband_absolute=100, min_publish_interval=60
+    )
+    assert publish_filter.is_significant(0)
+    assert publish_filter.get_delay(0) == 0
+
+
+def test_publish_filter_deadband():
+    """Test that changes within the deadband of the published value are dropped."""
+    publish_filter = SalerydLokePublishFilter.from_options(
+        {CONF_DEADBAND_ABSOLUTE: 0.5, CONF_DEADBAND_PERCENT: 10}
+    )
+    publish_filter.set_published(20, 0)
+    # percent deadband is larger
+    assert not publish_filter.is_significant(21.9)
+    assert publish_filter.is_significant(22)
+    assert publish_filter.is_significant(18)
+
+    publish_filter.set_published(2, 0)
+    # absolute deadband is larger
+    assert not publish_filter.is_significant(2.4)
+    assert publish_filter.is_significant(2.5)
+    # values that can not be compared are significant when changed
+    assert publish_filter.is_significant(None)
+    publish_filter.set_published(None, 0)
+    assert not publish_filter.is_significant(None)
+
+
+def test_publish_filter_min_interval():
+    """Test that values are delayed until the publish interval has passed."""
+    publish_filter = SalerydLokePublishFilter.from_options(
+        {CONF_MIN_PUBLISH_INTERVAL: 60}
+    )
+    publish_filter.set_published(20, 100)
+    assert publish_filter.get_delay(100) == 60
+    assert publish_filter.get_delay(130) == 30
+    assert publish_filter.get_delay(200) == 0
@@ -0,0 +1,106 @@
+"""Tests against the local websocket simulator."""
+
+import asyncio
+
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from pysaleryd.client import Client
+from pysaleryd.const import DataKeyEnum
+from pysaleryd.websocket import State
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.saleryd_hrv.const import (
+    CONF_WEBSOCKET_PORT,
+    CONFIG_VERSION,
+    DEFAULT_NAME,
+    DOMAIN,
+)
+
+from .common import MOCK_ENTRY_DATA
+from .simulator import SalerydSimulator, load_session
+
+_, INITIAL_STATE = next(load_session())
+
+
+async def wait_for(predicate, timeout=5):
+    """Wait until predicate is true"""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture(name="simulator")
+async def simulator_fixture(socket_enabled):
+    """Start simulator with initial state of the recorded session."""
+    simulator = SalerydSimulator(INITIAL_STATE, installer_password="1234")
+    await simulator.start()
+    yield simulator
+    await simulator.stop()
+
+
+@pytest.fixture(name="client")
+async def client_fixture(hass, simulator):
+    """Connect client to simulator."""
+    client = Client("127.0.0.1", simulator.port, async_create_clientsession(hass))
+    await client.connect()
+    yield client
+    client.disconnect()
+
+
+async def test_client_receives_state(client, simulator):
+    """Test client receives state on connect and on updates."""
+    await wait_for(lambda: client.data.get(DataKeyEnum.TARGET_TEMPERATURE_COOL))
+    assert client.data[DataKeyEnum.PRODUCT_NUMBER] == INITIAL_STATE["*SA"]
+
+    await simulator.update({DataKeyEnum.ERROR_MESSAGE: ["F1", "F2"]})
+    await wait_for(lambda: client.data.get(DataKeyEnum.ERROR_MESSAGE))
+    assert client.data[DataKeyEnum.ERROR_MESSAGE] == ["F1", "F2"]
+
+
+async def test_commands_are_acked(client, simulator):
+    """Test commands update state and are acked with min and max kept."""
+    await client.send_command(DataKeyEnum.MODE_FAN, 2)
+    await wait_for(lambda: client.data.get(DataKeyEnum.MODE_FAN) == "2+0+2")
+    assert simulator.state[DataKeyEnum.MODE_FAN] == "2+0+2"
+
+
+async def test_installer_commands_require_password(client, simulator):
+    """Test installer commands are rejected unless password is sent first."""
+    await client.send_command(DataKeyEnum.TARGET_TEMPERATURE_NORMAL, 22)
+    assert simulator.state[DataKeyEnum.TARGET_TEMPERATURE_NORMAL] == "21+10+30"
+
+    await client.send_command(DataKeyEnum.INSTALLER_PASSWORD, "1234")
+    await client.send_command(DataKeyEnum.TARGET_TEMPERATURE_NORMAL, 22)
+    assert simulator.state[DataKeyEnum.TARGET_TEMPERATURE_NORMAL] == "22+10+30"
+
+
+async def test_client_reconnects(client, simulator):
+    """Test client reconnects when connection is dropped."""
+    await wait_for(lambda: simulator.connection_count == 1)
+    await simulator.drop_connections()
+    # the client retries right away, the retrying state is too short to poll for
+    await wait_for(lambda: simulator.accepted_count == 2)
+    assert client.state == State.RUNNING
+    assert simulator.connection_count == 1
+
+
+async def test_setup_entry(hass, simulator):
+    """Test integration setup against simulator."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_ENTRY_DATA | {CONF_WEBSOCKET_PORT: simulator.port},
+        version=CONFIG_VERSION,
+        unique_id=DEFAULT_NAME,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await simulator.update({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "23"})
+    # acked commands push data to handlers without waiting for the update interval
+    await entry.runtime_data.bridge.send_command(DataKeyEnum.MODE_FAN, 1)
+    entity_id = f"sensor.{entry.unique_id}_supply_air_temperature"
+    await wait_for(lambda: hass.states.get(entity_id).state == "23")
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,85 @@
+"""Test saleryd_hrv long-term statistics."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, patch
+
+from homeassistant.components.recorder.models import StatisticMeanType
+from homeassistant.components.sensor import ATTR_STATE_CLASS
+from homeassistant.const import CONF_NAME, UnitOfTemperature
+from pysaleryd.const import DataKeyEnum
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.saleryd_hrv.const import (
+    CONF_STATISTICS,
+    DEFAULT_NAME,
+    DOMAIN,
+    STATISTICS_IMPORT_SECOND,
+)
+from custom_components.saleryd_hrv.statistics import SalerydLokeStatisticsAggregator
+
+from .common import setup_integration
+
+START = datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def test_aggregate_hours():
+    """Test that values are weighted by the time they were held, per hour."""
+    aggregator = SalerydLokeStatisticsAggregator(metadata={})
+    aggregator.record(20, START)
+    aggregator.record(22, START + timedelta(minutes=15))
+    # unavailable is not aggregated
+    aggregator.record(None, START + timedelta(minutes=45))
+    aggregator.record(21, START + timedelta(minutes=50))
+    assert aggregator.pop_hours(START + timedelta(minutes=59)) == []
+
+    (statistics,) = aggregator.pop_hours(START + timedelta(hours=1, minutes=1))
+    assert statistics["start"] == START
+    assert statistics["mean"] == pytest.approx((20 * 15 + 22 * 30 + 21 * 10) / 55)
+    assert statistics["min"] == 20
+    assert statistics["max"] == 22
+
+    # value held across the hour, without new values
+    (statistics,) = aggregator.pop_hours(START + timedelta(hours=2, seconds=10))
+    assert statistics["start"] == START + timedelta(hours=1)
+    assert statistics["mean"] == pytest.approx(21)
+
+
+async def test_import_statistics(hass, freezer):
+    """Test that sensor values are imported as statistics after each hour."""
+    freezer.move_to(START)
+    hass.config.components.add("recorder")
+    with patch(
+        "custom_components.saleryd_hrv.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        entry, client = await setup_integration(hass, options={CONF_STATISTICS: True})
+        client.push_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "20"})
+        # statistics are not also compiled by the recorder
+        state = hass.states.get(f"sensor.{entry.unique_id}_supply_air_temperature")
+        assert ATTR_STATE_CLASS not in state.attributes
+        freezer.tick(timedelta(minutes=15))
+        client.push_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "22"})
+        await hass.async_block_till_done()
+        add_statistics.assert_not_called()
+
+        freezer.move_to(START + timedelta(hours=1, seconds=STATISTICS_IMPORT_SECOND))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    # measurements without values are not imported
+    add_statistics.assert_called_once_with(hass, ANY, ANY)
+    _, metadata, (statistics,) = add_statistics.call_args.args
+    assert metadata == {
+        "mean_type": StatisticMeanType.ARITHMETIC,
+        "has_sum": False,
+        "name": f"{entry.data[CONF_NAME]} Supply air temperature",
+        "source": DOMAIN,
+        "statistic_id": f"{DOMAIN}:{DEFAULT_NAME}_supply_air_temperature",
+        "unit_of_measurement": UnitOfTemperature.CELSIUS,
+    }
+    assert statistics["start"] == START
+    assert statistics["mean"] == pytest.approx((20 * 15 + 22 * 45) / 60)
+    assert statistics["min"] == 20
+    assert statistics["max"] == 22
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,96 @@
+"""Test saleryd_hrv persisted data."""
+
+from datetime import timedelta
+
+from homeassistant.const import Platform
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pysaleryd.const import DataKeyEnum
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.saleryd_hrv.const import (
+    DOMAIN,
+    KEY_CLIENT_STATE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    STORAGE_VERSION,
+)
+
+from .common import setup_integration
+
+
+def snapshot_storage_key(hass) -> str:
+    """Return storage key of the snapshot of the only entry."""
+    entry = hass.config_entries.async_entries()[0]
+    return SNAPSHOT_STORAGE_KEY.format(entry_id=entry.entry_id)
+
+
+async def test_save_snapshot(hass, hass_storage):
+    """Test that the snapshot is saved at most once per save delay."""
+    _, client = await setup_integration(hass)
+    key = snapshot_storage_key(hass)
+
+    client.push_frame(
+        {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "20", DataKeyEnum.INSTALLER_PASSWORD: "1"}
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    client.push_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21"})
+    assert key not in hass_storage
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+    # latest data is saved, without virtual keys and the installer password
+    assert hass_storage[key]["data"]["data"] == {
+        DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21"
+    }
+
+
+async def test_restore_snapshot(hass, hass_storage):
+    """Test that entities show persisted data, marked stale, until data is received."""
+    saved_at = "2026-01-01T00:00:00+00:00"
+    hass_storage[SNAPSHOT_STORAGE_KEY.format(entry_id="restored")] = {
+        "version": STORAGE_VERSION,
+        "key": SNAPSHOT_STORAGE_KEY.format(entry_id="restored"),
+        "data": {
+            "saved_at": saved_at,
+            "data": {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "20"},
+        },
+    }
+    entry, client = await setup_integration(hass, entry_id="restored")
+    sensor_id = f"sensor.{entry.unique_id}_supply_air_temperature"
+    connection_id = er.async_get(hass).async_get_entity_id(
+        Platform.BINARY_SENSOR, DOMAIN, f"{entry.entry_id}_connection_state"
+    )
+
+    assert hass.states.get(sensor_id).state == "20"
+    attributes = hass.states.get(connection_id).attributes
+    assert attributes["restored_snapshot_saved_at"] == saved_at
+    assert KEY_CLIENT_STATE not in entry.runtime_data.coordinator.data
+
+    client.push_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21"})
+    assert hass.states.get(sensor_id).state == "21"
+    attributes = hass.states.get(connection_id).attributes
+    assert "restored_snapshot_saved_at" not in attributes
+
+
+async def test_restore_snapshot_select(hass, hass_storage):
+    """Test that selects show the persisted option, also when it is received again."""
+    hass_storage[SNAPSHOT_STORAGE_KEY.format(entry_id="restored")] = {
+        "version": STORAGE_VERSION,
+        "key": SNAPSHOT_STORAGE_KEY.format(entry_id="restored"),
+        "data": {
+            "saved_at": "2026-01-01T00:00:00+00:00",
+            "data": {DataKeyEnum.MODE_FAN: "1+0+2"},
+        },
+    }
+    entry, client = await setup_integration(hass, entry_id="restored")
+    entity_id = f"select.{entry.unique_id}_ventilation_mode"
+    assert hass.states.get(entity_id).state == "Away"
+
+    # unchanged value does not update the entity
+    client.push_frame({DataKeyEnum.MODE_FAN: "1+0+2"})
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "Away"
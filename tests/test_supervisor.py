@@ -0,0 +1,158 @@
+"""Test saleryd_hrv connection supervisor."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock, call, patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.util import dt as dt_util
+from pysaleryd.const import DataKeyEnum
+from pysaleryd.websocket import State
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.saleryd_hrv.const import (
+    CONF_LAZY_STARTUP,
+    CONFIG_VERSION,
+    DOMAIN,
+)
+from custom_components.saleryd_hrv.metrics import SalerydLokeMetrics
+from custom_components.saleryd_hrv.supervisor import (
+    SalerydLokeConnectionSupervisor,
+    get_backoff,
+)
+
+from .common import MOCK_ENTRY_DATA, FakeClient, setup_integration
+
+
+class UnreachableClient(FakeClient):
+    """Client that fails to connect."""
+
+    async def connect(self):
+        self.state = State.RETRYING
+        await asyncio.Event().wait()
+
+
+def test_backoff():
+    """Test first retry is immediate, then backing off exponentially with jitter."""
+    assert get_backoff(0) == 0
+    assert 0.5 <= get_backoff(1) <= 1
+    assert 2 <= get_backoff(3) <= 4
+    assert get_backoff(100) <= 60
+
+
+async def test_reconnect(hass):
+    """Test that a client that lost its connection is replaced."""
+    clients = iter(
+        [
+            UnreachableClient("127.0.0.1", 3001, None),
+            UnreachableClient("127.0.0.1", 3001, None),
+            FakeClient("127.0.0.1", 3001, None),
+        ]
+    )
+    metrics = SalerydLokeMetrics()
+    supervisor = SalerydLokeConnectionSupervisor(hass, lambda: next(clients), metrics)
+    on_reconnect = MagicMock()
+    on_state_changed = MagicMock()
+
+    client = FakeClient("127.0.0.1", 3001, None)
+    await client.connect()
+    client.data[DataKeyEnum.AIR_TEMPERATURE_SUPPLY] = "21"
+    supervisor.async_start(client, on_reconnect, on_state_changed)
+
+    client.state = State.RETRYING
+    with patch("custom_components.saleryd_hrv.supervisor.BACKOFF_INITIAL", 0.01):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    new_client = on_reconnect.call_args.args[0]
+    assert new_client.state == State.RUNNING
+    assert new_client.data == {DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21"}
+    assert client.state == State.STOPPED
+    assert on_state_changed.call_args_list == [
+        call(State.RETRYING),
+        call(State.RUNNING),
+    ]
+    assert metrics.disconnects == 1
+    assert metrics.connect_failures == 2
+    assert metrics.reconnects == 1
+    assert metrics.disconnect_duration.count == 1
+
+    supervisor.async_shutdown()
+
+
+async def test_connection_state_while_reconnecting(hass):
+    """Test that the connection state is off while reconnecting."""
+    entry, client = await setup_integration(hass)
+    client.push_frame({DataKeyEnum.AIR_TEMPERATURE_SUPPLY: "21"})
+    await hass.async_block_till_done()
+    entity_id = f"binary_sensor.{entry.unique_id}_connection_state"
+    assert hass.states.get(entity_id).state == STATE_ON
+
+    # the replaced client is disconnected and does not send frames
+    client.state = State.RETRYING
+    with patch("custom_components.saleryd_hrv.Client", UnreachableClient):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+    assert client.state == State.STOPPED
+    assert hass.states.get(entity_id).state == STATE_OFF
+
+    with (
+        patch("custom_components.saleryd_hrv.Client", FakeClient),
+        patch("custom_components.saleryd_hrv.supervisor.BACKOFF_INITIAL", 0.01),
+    ):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+        await hass.async_block_till_done(wait_background_tasks=True)
+    assert entry.runtime_data.client is not client
+    assert hass.states.get(entity_id).state == STATE_ON
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_connect_timeout(hass):
+    """Test that connecting gives up after timeout."""
+    supervisor = SalerydLokeConnectionSupervisor(
+        hass,
+        lambda: UnreachableClient("127.0.0.1", 3001, None),
+        SalerydLokeMetrics(),
+    )
+    with pytest.raises(TimeoutError):
+        await supervisor.async_connect(0.1)
+
+
+async def test_lazy_startup(hass):
+    """Test that entities are set up before connecting, when connecting lazily."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_ENTRY_DATA,
+        options={CONF_LAZY_STARTUP: True},
+        version=CONFIG_VERSION,
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.saleryd_hrv.Client", UnreachableClient):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert entry.runtime_data.client is None
+    assert hass.states.async_entity_ids("sensor")
+
+    # the first client is connected in the background, backing off between attempts
+    with (
+        patch("custom_components.saleryd_hrv.Client", FakeClient),
+        patch("custom_components.saleryd_hrv.supervisor.BACKOFF_INITIAL", 0.01),
+    ):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    client = entry.runtime_data.client
+    assert client.state == State.RUNNING
+    assert entry.runtime_data.bridge.update_data_callback in client._handlers
+    assert entry.runtime_data.metrics.connect_failures >= 1
+    assert entry.runtime_data.metrics.reconnects == 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)